@@ -0,0 +1,72 @@
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+import httpx
+
+def percentile(samples: list, pct: float) -> float:
+    samples = sorted(samples)
+    return samples[max(int(len(samples) * pct) - 1, 0)]
+
+def summarize(label: str, samples: list, errors: int = 0):
+    if not samples:
+        print(f"{label:<10} no successful requests ({errors} errors)")
+        return
+    print(
+        f"{label:<10} n={len(samples):<5} p50 {statistics.median(samples):8.1f}ms  "
+        f"p99 {percentile(samples, 0.99):8.1f}ms  errors {errors}"
+    )
+
+async def login_worker(client: httpx.AsyncClient, credentials: dict, count: int, samples: list, errors: list):
+    for _ in range(count):
+        started = time.perf_counter()
+        response = await client.post("/auth/login", json=credentials)
+        elapsed = (time.perf_counter() - started) * 1000
+        if response.status_code == 200:
+            samples.append(elapsed)
+        else:
+            errors.append(response.status_code)
+
+async def health_prober(client: httpx.AsyncClient, stop: asyncio.Event, samples: list, interval: float):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/health")
+        samples.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+
+async def run(base_url: str, concurrency: int, logins: int, interval: float):
+    credentials = {"email": f"bench-{uuid.uuid4().hex[:8]}@example.com", "password": "benchmark-password"}
+    limits = httpx.Limits(max_connections=concurrency + 1)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        response = await client.post("/auth/register", json=credentials)
+        response.raise_for_status()
+        
+        login_samples, login_errors, health_samples = [], [], []
+        stop = asyncio.Event()
+        prober = asyncio.create_task(health_prober(client, stop, health_samples, interval))
+        
+        per_worker = max(logins // concurrency, 1)
+        started = time.perf_counter()
+        await asyncio.gather(*[
+            login_worker(client, credentials, per_worker, login_samples, login_errors)
+            for _ in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await prober
+    
+    print(f"{len(login_samples)} logins in {elapsed:.1f}s with {concurrency} concurrent clients")
+    summarize("login", login_samples, len(login_errors))
+    summarize("/health", health_samples)
+    if login_errors:
+        print(f"login error statuses: {sorted(set(login_errors))}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure login and /health latency under concurrent logins")
+    parser.add_argument("--url", default="http://localhost:8001")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=500)
+    parser.add_argument("--health-interval", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.concurrency, args.logins, args.health_interval))
@@ -0,0 +1,78 @@
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "GeoService"))
+
+from spatial import GridIndex, Region, point_in_polygons
+
+def jittered_grid(side: int, cell: float, jitter: float):
+    return [
+        [(x * cell + random.uniform(-jitter, jitter) if 0 < x < side else x * cell,
+          y * cell + random.uniform(-jitter, jitter) if 0 < y < side else y * cell)
+         for y in range(side + 1)]
+        for x in range(side + 1)
+    ]
+
+def densify(a, b, steps: int):
+    return [(a[0] + (b[0] - a[0]) * i / steps, a[1] + (b[1] - a[1]) * i / steps) for i in range(steps)]
+
+def build_regions(count: int, cell: float, vertices_per_edge: int):
+    side = math.ceil(math.sqrt(count))
+    corners = jittered_grid(side, cell, cell * 0.2)
+    regions = []
+    for x in range(side):
+        for y in range(side):
+            if len(regions) == count:
+                return regions, side * cell
+            a, b, c, d = corners[x][y], corners[x + 1][y], corners[x + 1][y + 1], corners[x][y + 1]
+            ring = densify(a, b, vertices_per_edge) + densify(b, c, vertices_per_edge) + \
+                densify(c, d, vertices_per_edge) + densify(d, a, vertices_per_edge) + [a]
+            regions.append(Region(f"m{len(regions)}", f"Municipality {len(regions)}", [[ring]]))
+    return regions, side * cell
+
+def linear_locate(regions, lon: float, lat: float):
+    for region in regions:
+        if region.min_lon <= lon <= region.max_lon and region.min_lat <= lat <= region.max_lat:
+            if point_in_polygons(lon, lat, region.polygons):
+                return region
+    return None
+
+def time_lookups(locate, points) -> float:
+    started = time.perf_counter()
+    for lon, lat in points:
+        locate(lon, lat)
+    return (time.perf_counter() - started) / len(points) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10,100,1000,10000", help="comma separated polygon counts")
+    parser.add_argument("--lookups", type=int, default=20000)
+    parser.add_argument("--linear-lookups", type=int, default=2000)
+    parser.add_argument("--polygon-size", type=float, default=0.1, help="polygon width in degrees")
+    parser.add_argument("--cell-degrees", type=float, default=0.05)
+    parser.add_argument("--vertices-per-edge", type=int, default=16)
+    args = parser.parse_args()
+
+    random.seed(42)
+    print(f"{'polygons':>9} {'build ms':>9} {'grid us':>9} {'linear us':>10} {'speedup':>8}")
+    for count in (int(size) for size in args.sizes.split(",")):
+        regions, extent = build_regions(count, args.polygon_size, args.vertices_per_edge)
+        points = [(random.uniform(0, extent), random.uniform(0, extent)) for _ in range(args.lookups)]
+
+        started = time.perf_counter()
+        index = GridIndex(regions, args.cell_degrees)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        for lon, lat in points[:200]:
+            assert index.locate(lon, lat) is linear_locate(regions, lon, lat)
+
+        grid_us = time_lookups(index.locate, points)
+        linear_us = time_lookups(lambda lon, lat: linear_locate(regions, lon, lat), points[:args.linear_lookups])
+        print(f"{count:>9} {build_ms:>9.1f} {grid_us:>9.2f} {linear_us:>10.2f} {linear_us / grid_us:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
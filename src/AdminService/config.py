@@ -0,0 +1,7 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+STATS_MAX_STALENESS = int(os.getenv("STATS_MAX_STALENESS", "300"))
+STATS_REFRESH_LEASE_SECONDS = int(os.getenv("STATS_REFRESH_LEASE_SECONDS", "120"))
\ No newline at end of file
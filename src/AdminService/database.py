@@ -12,6 +12,7 @@ db = client.cityfix
 municipalities_collection = db.municipalities
 tickets_collection = db.tickets
 users_collection = db.users
+stats_collection = db.stats
 
 async def get_database():
     return db
\ No newline at end of file
@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+from typing import Optional
+from fastapi.encoders import jsonable_encoder
+from database import tickets_collection
+
+EXPORT_BATCH_SIZE = 500
+
+CSV_COLUMNS = [
+    "_id", "title", "description", "status", "category", "tenant_id",
+    "reported_by", "assigned_to", "lat", "lon", "address",
+    "comment_count", "created_at", "updated_at"
+]
+
+def _ticket_cursor(query: dict, projection: Optional[dict] = None):
+    return tickets_collection.find(query, projection).sort(
+        [("created_at", -1), ("_id", -1)]
+    ).batch_size(EXPORT_BATCH_SIZE)
+
+def _serialize(ticket: dict) -> str:
+    ticket["_id"] = str(ticket["_id"])
+    return json.dumps(jsonable_encoder(ticket))
+
+async def stream_json(query: dict):
+    yield "["
+    first = True
+    async for ticket in _ticket_cursor(query):
+        yield ("" if first else ",") + _serialize(ticket)
+        first = False
+    yield "]"
+
+async def stream_ndjson(query: dict):
+    async for ticket in _ticket_cursor(query):
+        yield _serialize(ticket) + "\n"
+
+def _csv_line(values: list) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue()
+
+async def stream_csv(query: dict):
+    yield _csv_line(CSV_COLUMNS)
+    projection = {
+        "title": 1,
+        "description": 1,
+        "status": 1,
+        "category": 1,
+        "tenant_id": 1,
+        "reported_by": 1,
+        "assigned_to": 1,
+        "location": 1,
+        "comment_count": {"$ifNull": ["$comment_count", {"$size": {"$ifNull": ["$comments", []]}}]},
+        "created_at": 1,
+        "updated_at": 1
+    }
+    async for ticket in _ticket_cursor(query, projection):
+        location = ticket.get("location") or {}
+        yield _csv_line([
+            str(ticket["_id"]),
+            ticket.get("title"),
+            ticket.get("description"),
+            ticket.get("status"),
+            ticket.get("category"),
+            ticket.get("tenant_id"),
+            ticket.get("reported_by"),
+            ticket.get("assigned_to"),
+            location.get("lat"),
+            location.get("lon"),
+            location.get("address"),
+            ticket.get("comment_count"),
+            ticket["created_at"].isoformat() if ticket.get("created_at") else None,
+            ticket["updated_at"].isoformat() if ticket.get("updated_at") else None
+        ])
+
+EXPORT_FORMATS = {
+    "json": (stream_json, "application/json"),
+    "ndjson": (stream_ndjson, "application/x-ndjson"),
+    "csv": (stream_csv, "text/csv"),
+}
\ No newline at end of file
@@ -0,0 +1,26 @@
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, IndexModel
+from common import mongo_indexes
+from datetime import datetime
+from database import municipalities_collection, tickets_collection, stats_collection
+
+NEWEST_FIRST = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+INDEXES = [
+    (municipalities_collection, [
+        IndexModel([("name", ASCENDING)], name="name_unique", unique=True),
+        IndexModel([("boundary", GEOSPHERE)], name="boundary_2dsphere"),
+    ]),
+]
+
+ROUTE_QUERIES = [
+    ("POST /admin/municipalities", municipalities_collection, {"name": "municipality"}, None),
+    ("GET /admin/stats", stats_collection, {"_id": "tickets"}, None),
+    ("GET /admin/stats refresh", tickets_collection, {"created_at": {"$lt": datetime(2024, 1, 1)}}, None),
+    ("GET /admin/tickets/all", tickets_collection, {}, NEWEST_FIRST),
+]
+
+async def ensure_indexes():
+    await mongo_indexes.ensure_indexes(INDEXES)
+
+async def check_indexes() -> bool:
+    return await mongo_indexes.check_indexes(ROUTE_QUERIES)
\ No newline at end of file
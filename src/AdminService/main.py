@@ -4,6 +4,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from routes import router
+from indexes import ensure_indexes, check_indexes
+from stats import stop_refresh
 
 load_dotenv()
 
@@ -37,12 +39,23 @@ async def health_check():
 @app.on_event("startup")
 async def startup_event():
     logger.info("Admin Service starting up...")
+    await ensure_indexes()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Admin Service shutting down...")
+    await stop_refresh()
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--check-indexes", action="store_true", help="explain every route query and report collection scans")
+    args = parser.parse_args()
+    
+    if args.check_indexes:
+        import asyncio
+        raise SystemExit(0 if asyncio.run(check_indexes()) else 1)
+    
     import uvicorn
     port = int(os.getenv("PORT", 8002))
     uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 class Location(BaseModel):
@@ -7,10 +7,15 @@ class Location(BaseModel):
     lon: float
     address: Optional[str] = None
 
+class Boundary(BaseModel):
+    type: str = Field(pattern="^(Polygon|MultiPolygon)$")
+    coordinates: List[Any]
+
 class MunicipalityCreate(BaseModel):
     name: str
     location: Location
     admin_id: str
+    boundary: Optional[Boundary] = None
 
 class MunicipalityResponse(BaseModel):
     id: str = Field(alias="_id")
@@ -1,8 +1,15 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from datetime import datetime
-from models import MunicipalityCreate, MunicipalityResponse, Stats
-from database import municipalities_collection, tickets_collection, users_collection
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, WriteError
+from models import MunicipalityCreate, MunicipalityResponse, Stats, Boundary
+from database import municipalities_collection
+from config import STATS_MAX_STALENESS
+from stats import get_snapshot, record_municipality_created
+from export import EXPORT_FORMATS
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,7 +19,7 @@ router = APIRouter()
 async def get_municipalities():
     logger.info("Fetching all municipalities")
     municipalities = []
-    async for municipality in municipalities_collection.find():
+    async for municipality in municipalities_collection.find({}, {"boundary": 0}):
         municipality["_id"] = str(municipality["_id"])
         municipalities.append(MunicipalityResponse(**municipality))
     return municipalities
@@ -21,63 +28,104 @@ async def get_municipalities():
 async def create_municipality(municipality: MunicipalityCreate):
     logger.info(f"Creating municipality: {municipality.name}")
     
-    existing = await municipalities_collection.find_one({"name": municipality.name})
-    if existing:
+    municipality_dict = municipality.model_dump()
+    municipality_dict["created_at"] = datetime.utcnow()
+    if municipality_dict["boundary"] is None:
+        del municipality_dict["boundary"]
+    else:
+        municipality_dict["boundary_updated_at"] = municipality_dict["created_at"]
+    
+    try:
+        result = await municipalities_collection.insert_one(municipality_dict)
+    except DuplicateKeyError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Municipality with this name already exists"
         )
+    except WriteError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid boundary geometry"
+        )
     
-    municipality_dict = municipality.model_dump()
-    municipality_dict["created_at"] = datetime.utcnow()
-    
-    result = await municipalities_collection.insert_one(municipality_dict)
-    created = await municipalities_collection.find_one({"_id": result.inserted_id})
+    await record_municipality_created()
     
-    created["_id"] = str(created["_id"])
-    return MunicipalityResponse(**created)
+    municipality_dict["_id"] = str(result.inserted_id)
+    return MunicipalityResponse(**municipality_dict)
 
-@router.get("/stats", response_model=Stats)
-async def get_stats():
-    logger.info("Fetching statistics")
+@router.put("/municipalities/{municipality_id}/boundary", response_model=MunicipalityResponse)
+async def set_municipality_boundary(municipality_id: str, boundary: Boundary):
+    logger.info(f"Updating boundary of municipality: {municipality_id}")
     
-    total_tickets = await tickets_collection.count_documents({})
-    pending_tickets = await tickets_collection.count_documents({"status": "pending"})
-    in_progress_tickets = await tickets_collection.count_documents({"status": "in_progress"})
-    completed_tickets = await tickets_collection.count_documents({"status": "completed"})
-    total_municipalities = await municipalities_collection.count_documents({})
-    total_users = await users_collection.count_documents({})
+    try:
+        obj_id = ObjectId(municipality_id)
+    except:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid municipality ID format"
+        )
     
-    tickets_by_category = {}
-    categories_cursor = tickets_collection.aggregate([
-        {"$group": {"_id": "$category", "count": {"$sum": 1}}}
-    ])
-    async for cat in categories_cursor:
-        tickets_by_category[cat["_id"]] = cat["count"]
+    try:
+        updated_municipality = await municipalities_collection.find_one_and_update(
+            {"_id": obj_id},
+            {"$set": {"boundary": boundary.model_dump(), "boundary_updated_at": datetime.utcnow()}},
+            projection={"boundary": 0},
+            return_document=ReturnDocument.AFTER
+        )
+    except WriteError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid boundary geometry"
+        )
+    
+    if not updated_municipality:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Municipality not found"
+        )
+    
+    updated_municipality["_id"] = str(updated_municipality["_id"])
+    return MunicipalityResponse(**updated_municipality)
+
+@router.get("/stats", response_model=Stats)
+async def get_stats(max_staleness: int = Query(STATS_MAX_STALENESS, ge=0)):
+    logger.info(f"Fetching statistics (max_staleness: {max_staleness}s)")
     
-    tickets_by_municipality = {}
-    municipalities_cursor = tickets_collection.aggregate([
-        {"$group": {"_id": "$tenant_id", "count": {"$sum": 1}}}
-    ])
-    async for mun in municipalities_cursor:
-        tickets_by_municipality[str(mun["_id"])] = mun["count"]
+    snapshot = await get_snapshot(max_staleness)
+    by_status = snapshot["by_status"]
     
     return Stats(
-        total_tickets=total_tickets,
-        pending_tickets=pending_tickets,
-        in_progress_tickets=in_progress_tickets,
-        completed_tickets=completed_tickets,
-        total_municipalities=total_municipalities,
-        total_users=total_users,
-        tickets_by_category=tickets_by_category,
-        tickets_by_municipality=tickets_by_municipality
+        total_tickets=snapshot["total_tickets"],
+        pending_tickets=by_status.get("pending", 0),
+        in_progress_tickets=by_status.get("in_progress", 0),
+        completed_tickets=by_status.get("completed", 0),
+        total_municipalities=snapshot["total_municipalities"],
+        total_users=snapshot["total_users"],
+        tickets_by_category={k: v for k, v in snapshot["by_category"].items() if v},
+        tickets_by_municipality={k: v for k, v in snapshot["by_municipality"].items() if v}
     )
 
 @router.get("/tickets/all")
-async def get_all_tickets():
-    logger.info("Fetching all tickets across municipalities")
-    tickets = []
-    async for ticket in tickets_collection.find().sort("created_at", -1):
-        ticket["_id"] = str(ticket["_id"])
-        tickets.append(ticket)
-    return tickets
\ No newline at end of file
+async def get_all_tickets(
+    format: str = Query("json", pattern="^(json|ndjson|csv)$"),
+    tenant_id: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+):
+    logger.info(f"Exporting tickets - format: {format}, tenant_id: {tenant_id}, from: {created_from}, to: {created_to}")
+    
+    query = {}
+    if tenant_id:
+        query["tenant_id"] = tenant_id
+    if created_from or created_to:
+        query["created_at"] = {}
+        if created_from:
+            query["created_at"]["$gte"] = created_from
+        if created_to:
+            query["created_at"]["$lt"] = created_to
+    
+    stream, media_type = EXPORT_FORMATS[format]
+    headers = {}
+    if format != "json":
+        headers["Content-Disposition"] = f"attachment; filename=tickets.{format}"
+    return StreamingResponse(stream(query), media_type=media_type, headers=headers)
\ No newline at end of file
@@ -0,0 +1,151 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from database import municipalities_collection, tickets_collection, users_collection, stats_collection
+from config import STATS_REFRESH_LEASE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_ID = "tickets"
+COUNTERS = ["total_tickets", "total_municipalities"]
+BUCKETS = ["by_status", "by_category", "by_municipality"]
+MERGE_ATTEMPTS = 5
+
+STATS_FACETS = [
+    {
+        "$facet": {
+            "by_status": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+            "by_category": [{"$group": {"_id": "$category", "count": {"$sum": 1}}}],
+            "by_municipality": [{"$group": {"_id": "$tenant_id", "count": {"$sum": 1}}}],
+        }
+    }
+]
+
+_refresh_task: Optional[asyncio.Task] = None
+
+def _to_counts(buckets: list) -> dict:
+    return {str(bucket["_id"]): bucket["count"] for bucket in buckets}
+
+def stats_pipeline(cutoff: Optional[datetime]) -> list:
+    if not cutoff:
+        return STATS_FACETS
+    return [{"$match": {"created_at": {"$lt": cutoff}}}] + STATS_FACETS
+
+def _merge(fresh: dict, started: Optional[dict], current: Optional[dict]) -> dict:
+    # Increments applied after the watermark moved the stored counters from
+    # `started` to `current`; carry that difference over onto the fresh counts.
+    # Tickets created after the watermark are left out of the aggregation, so
+    # they only arrive through these increments.
+    if not started or not current:
+        return fresh
+    merged = dict(fresh)
+    for field in COUNTERS:
+        merged[field] = fresh[field] + current.get(field, 0) - started.get(field, 0)
+    for bucket in BUCKETS:
+        counts = dict(fresh[bucket])
+        before, after = started.get(bucket) or {}, current.get(bucket) or {}
+        for key in set(before) | set(after):
+            counts[key] = counts.get(key, 0) + after.get(key, 0) - before.get(key, 0)
+        merged[bucket] = counts
+    return merged
+
+async def _acquire_lease() -> Optional[dict]:
+    # Returns the counters as they stood when the lease was taken, together with
+    # the server time of that moment, which is the watermark of this refresh.
+    now = datetime.utcnow()
+    return await stats_collection.find_one_and_update(
+        {"_id": SNAPSHOT_ID, "$or": [{"refresh_lease_until": None}, {"refresh_lease_until": {"$lt": now}}]},
+        {
+            "$set": {"refresh_lease_until": now + timedelta(seconds=STATS_REFRESH_LEASE_SECONDS)},
+            "$currentDate": {"refresh_started_at": True}
+        },
+        return_document=ReturnDocument.AFTER
+    )
+
+async def _save(fresh: dict, started: Optional[dict]) -> dict:
+    for _ in range(MERGE_ATTEMPTS):
+        current = await stats_collection.find_one({"_id": SNAPSHOT_ID})
+        version = current.get("version", 0) if current else 0
+        snapshot = _merge(fresh, started, current)
+        snapshot["version"] = version + 1
+        snapshot["refresh_lease_until"] = None
+        try:
+            result = await stats_collection.replace_one(
+                {"_id": SNAPSHOT_ID, "version": current.get("version") if current else None},
+                snapshot,
+                upsert=True
+            )
+        except DuplicateKeyError:
+            continue
+        if result.matched_count or result.upserted_id is not None:
+            return snapshot
+    raise RuntimeError("Stats snapshot kept changing during refresh")
+
+async def refresh_snapshot() -> dict:
+    started_at = time.perf_counter()
+    started = await stats_collection.find_one({"_id": SNAPSHOT_ID})
+    if started:
+        leased = await _acquire_lease()
+        if not leased:
+            logger.info("Stats snapshot refresh already running elsewhere")
+            return started
+        started = leased
+    cutoff = started["refresh_started_at"] if started else None
+    
+    facets = await tickets_collection.aggregate(stats_pipeline(cutoff)).to_list(length=1)
+    facets = facets[0] if facets else {}
+    by_status = _to_counts(facets.get("by_status", []))
+    
+    now = datetime.utcnow()
+    snapshot = await _save({
+        "total_tickets": sum(by_status.values()),
+        "by_status": by_status,
+        "by_category": _to_counts(facets.get("by_category", [])),
+        "by_municipality": _to_counts(facets.get("by_municipality", [])),
+        "total_municipalities": await municipalities_collection.estimated_document_count(),
+        "total_users": await users_collection.estimated_document_count(),
+        "refreshed_at": now,
+        "updated_at": now
+    }, started)
+    
+    logger.info(f"Stats snapshot refreshed in {(time.perf_counter() - started_at) * 1000:.0f}ms")
+    return snapshot
+
+def _refresh() -> asyncio.Task:
+    global _refresh_task
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.create_task(refresh_snapshot())
+        _refresh_task.add_done_callback(_log_refresh_failure)
+    return _refresh_task
+
+def _log_refresh_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception():
+        logger.error(f"Stats snapshot refresh failed: {str(task.exception())}")
+
+async def get_snapshot(max_staleness: int) -> dict:
+    snapshot = await stats_collection.find_one({"_id": SNAPSHOT_ID})
+    if snapshot and snapshot.get("refreshed_at"):
+        age = (datetime.utcnow() - snapshot["refreshed_at"]).total_seconds()
+        if age <= max_staleness:
+            return snapshot
+    
+    # Serve the stale snapshot while a single background task recomputes it;
+    # only a missing snapshot or an explicit max_staleness=0 waits for the scan.
+    if snapshot and max_staleness > 0:
+        _refresh()
+        return snapshot
+    return await asyncio.shield(_refresh())
+
+async def stop_refresh():
+    if _refresh_task and not _refresh_task.done():
+        _refresh_task.cancel()
+
+async def record_municipality_created():
+    await stats_collection.update_one(
+        {"_id": SNAPSHOT_ID},
+        {"$inc": {"total_municipalities": 1, "version": 1}, "$set": {"updated_at": datetime.utcnow()}}
+    )
\ No newline at end of file
@@ -0,0 +1,20 @@
+from pymongo import ASCENDING, IndexModel
+from common import mongo_indexes
+from database import users_collection
+
+INDEXES = [
+    (users_collection, [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ]),
+]
+
+ROUTE_QUERIES = [
+    ("POST /auth/register", users_collection, {"email": "user@example.com"}, None),
+    ("POST /auth/login", users_collection, {"email": "user@example.com"}, None),
+]
+
+async def ensure_indexes():
+    await mongo_indexes.ensure_indexes(INDEXES)
+
+async def check_indexes() -> bool:
+    return await mongo_indexes.check_indexes(ROUTE_QUERIES)
\ No newline at end of file
@@ -1,9 +1,12 @@
 import os
 import logging
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from routes import router
+from indexes import ensure_indexes, check_indexes
+from security import shutdown_password_hasher, PasswordHasherBusy
 
 load_dotenv()
 
@@ -28,6 +31,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    logger.warning(f"Password hashing queue full, rejecting {request.url.path}")
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Authentication service busy, please retry"},
+        headers={"Retry-After": "1"}
+    )
+
 app.include_router(router, prefix="/auth", tags=["Authentication"])
 
 @app.get("/health")
@@ -37,12 +49,23 @@ async def health_check():
 @app.on_event("startup")
 async def startup_event():
     logger.info("Auth Service starting up...")
+    await ensure_indexes()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Auth Service shutting down...")
+    shutdown_password_hasher()
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--check-indexes", action="store_true", help="explain every route query and report collection scans")
+    args = parser.parse_args()
+    
+    if args.check_indexes:
+        import asyncio
+        raise SystemExit(0 if asyncio.run(check_indexes()) else 1)
+    
     import uvicorn
     port = int(os.getenv("PORT", 8001))
     uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)
\ No newline at end of file
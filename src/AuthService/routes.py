@@ -1,41 +1,43 @@
 from fastapi import APIRouter, HTTPException, status, Header
 from typing import Optional
 from datetime import datetime
+from pymongo.errors import DuplicateKeyError
 from models import UserCreate, UserResponse, LoginRequest, TokenResponse
 from database import users_collection
-from security import verify_password, get_password_hash, create_access_token, verify_token
+from security import verify_password, get_password_hash, create_access_token, verify_token, USER_CACHE_SIZE, USER_CACHE_TTL
+from common.ttl_cache import TTLCache
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+user_cache = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(user: UserCreate):
     logger.info(f"Registration attempt for email: {user.email}")
     
-    existing_user = await users_collection.find_one({"email": user.email})
-    if existing_user:
+    user_dict = user.model_dump(exclude={"password"})
+    user_dict["password_hash"] = await get_password_hash(user.password)
+    user_dict["created_at"] = datetime.utcnow()
+    
+    try:
+        result = await users_collection.insert_one(user_dict)
+    except DuplicateKeyError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    user_dict = user.model_dump(exclude={"password"})
-    user_dict["password_hash"] = get_password_hash(user.password)
-    user_dict["created_at"] = datetime.utcnow()
-    
-    result = await users_collection.insert_one(user_dict)
-    created_user = await users_collection.find_one({"_id": result.inserted_id})
-    
-    created_user["_id"] = str(created_user["_id"])
-    return UserResponse(**created_user)
+    user_dict["_id"] = str(result.inserted_id)
+    return UserResponse(**user_dict)
 
 @router.post("/login", response_model=TokenResponse)
 async def login(credentials: LoginRequest):
     logger.info(f"Login attempt for email: {credentials.email}")
     
     user = await users_collection.find_one({"email": credentials.email})
-    if not user or not verify_password(credentials.password, user["password_hash"]):
+    if not user or not await verify_password(credentials.password, user["password_hash"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -74,6 +76,10 @@ async def get_current_user(authorization: Optional[str] = Header(None)):
         )
     
     user_id = payload.get("sub")
+    cached_user = user_cache.get(user_id)
+    if cached_user is not None:
+        return cached_user
+    
     from bson import ObjectId
     user = await users_collection.find_one({"_id": ObjectId(user_id)})
     
@@ -84,7 +90,9 @@ async def get_current_user(authorization: Optional[str] = Header(None)):
         )
     
     user["_id"] = str(user["_id"])
-    return UserResponse(**user)
+    user_response = UserResponse(**user)
+    user_cache.set(user_id, user_response)
+    return user_response
 
 @router.post("/logout")
 async def logout():
@@ -1,13 +1,15 @@
 import { useEffect, useState } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import api from '@/services/api';
-import { Ticket } from '@/types';
+import { Ticket, Comment } from '@/types';
 
 export default function TicketDetails() {
   const { id } = useParams<{ id: string }>();
   const navigate = useNavigate();
   const [ticket, setTicket] = useState<Ticket | null>(null);
   const [loading, setLoading] = useState(true);
+  const [allComments, setAllComments] = useState<Comment[] | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
 
   useEffect(() => {
     const fetchTicket = async () => {
@@ -24,6 +26,19 @@ export default function TicketDetails() {
     fetchTicket();
   }, [id]);
 
+  const loadOlderComments = async () => {
+    try {
+      const response = await api.get(`/tickets/${id}/comments`, {
+        params: { limit: 50, cursor: nextCursor || undefined },
+      });
+      const page: Comment[] = [...response.data].reverse();
+      setAllComments((previous) => [...page, ...(previous || [])]);
+      setNextCursor(response.headers['x-next-cursor'] || null);
+    } catch (error) {
+      console.error('Failed to fetch comments:', error);
+    }
+  };
+
   if (loading) {
     return <div className="min-h-screen flex items-center justify-center">Caricamento...</div>;
   }
@@ -32,6 +47,11 @@ export default function TicketDetails() {
     return <div className="min-h-screen flex items-center justify-center">Ticket non trovato</div>;
   }
 
+  const comments = allComments || ticket.comments || [];
+  const hasOlderComments = allComments
+    ? nextCursor !== null
+    : (ticket.comment_count || 0) > comments.length;
+
   return (
     <div className="min-h-screen bg-gray-50 py-8">
       <div className="max-w-4xl mx-auto px-4">
@@ -79,12 +99,20 @@ export default function TicketDetails() {
             </div>
           </div>
 
-          {ticket.comments && ticket.comments.length > 0 && (
+          {comments.length > 0 && (
             <div className="mb-6">
               <h3 className="font-semibold mb-3">Commenti</h3>
+              {hasOlderComments && (
+                <button
+                  onClick={loadOlderComments}
+                  className="mb-3 text-sm text-blue-600 hover:text-blue-800"
+                >
+                  Carica commenti precedenti
+                </button>
+              )}
               <div className="space-y-3">
-                {ticket.comments.map((comment, index) => (
-                  <div key={index} className="bg-gray-50 p-4 rounded">
+                {comments.map((comment, index) => (
+                  <div key={comment.id || index} className="bg-gray-50 p-4 rounded">
                     <p className="text-gray-700">{comment.message}</p>
                     <p className="text-xs text-gray-500 mt-2">
                       {new Date(comment.created_at).toLocaleString()}
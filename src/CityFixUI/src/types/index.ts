@@ -24,12 +24,14 @@ export interface User {
     images: string[];
     tenant_id: string;
     comments: Comment[];
+    comment_count?: number;
     feedback?: Feedback;
     created_at: string;
     updated_at: string;
   }
   
   export interface Comment {
+    id?: string;
     user_id: string;
     message: string;
     created_at: string;
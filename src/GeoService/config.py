@@ -0,0 +1,17 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+GEOCODER_USER_AGENT = os.getenv("GEOCODER_USER_AGENT", "cityfix_geoservice")
+GEOCODER_DOMAIN = os.getenv("GEOCODER_DOMAIN", "nominatim.openstreetmap.org")
+GEOCODER_SCHEME = os.getenv("GEOCODER_SCHEME", "https")
+GEOCODER_TIMEOUT = float(os.getenv("GEOCODER_TIMEOUT", "5"))
+GEOCODE_CONCURRENCY = int(os.getenv("GEOCODE_CONCURRENCY", "1"))
+GEOCODE_MIN_INTERVAL_SECONDS = float(os.getenv("GEOCODE_MIN_INTERVAL_SECONDS", "1"))
+GEOCODE_CACHE_SIZE = int(os.getenv("GEOCODE_CACHE_SIZE", "2048"))
+GEOCODE_CACHE_TTL_SECONDS = int(os.getenv("GEOCODE_CACHE_TTL_SECONDS", "2592000"))
+GEOCODE_NEGATIVE_CACHE_TTL_SECONDS = int(os.getenv("GEOCODE_NEGATIVE_CACHE_TTL_SECONDS", "3600"))
+REVERSE_GEOCODE_PRECISION = int(os.getenv("REVERSE_GEOCODE_PRECISION", "4"))
+LOCATOR_CELL_DEGREES = float(os.getenv("LOCATOR_CELL_DEGREES", "0.05"))
+LOCATOR_REFRESH_SECONDS = float(os.getenv("LOCATOR_REFRESH_SECONDS", "30"))
\ No newline at end of file
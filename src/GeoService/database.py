@@ -10,6 +10,7 @@ client = AsyncIOMotorClient(MONGODB_URL)
 db = client.cityfix
 
 municipalities_collection = db.municipalities
+geocode_cache_collection = db.geocode_cache
 
 async def get_database():
     return db
\ No newline at end of file
@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from geopy.geocoders import Nominatim
+from common.ttl_cache import TTLCache
+from database import geocode_cache_collection
+from config import (
+    GEOCODER_USER_AGENT,
+    GEOCODER_DOMAIN,
+    GEOCODER_SCHEME,
+    GEOCODER_TIMEOUT,
+    GEOCODE_CONCURRENCY,
+    GEOCODE_MIN_INTERVAL_SECONDS,
+    GEOCODE_CACHE_SIZE,
+    GEOCODE_CACHE_TTL_SECONDS,
+    GEOCODE_NEGATIVE_CACHE_TTL_SECONDS,
+    REVERSE_GEOCODE_PRECISION,
+)
+
+logger = logging.getLogger(__name__)
+
+_geocoder = Nominatim(
+    user_agent=GEOCODER_USER_AGENT,
+    domain=GEOCODER_DOMAIN,
+    scheme=GEOCODER_SCHEME,
+    timeout=GEOCODER_TIMEOUT
+)
+_semaphore = asyncio.Semaphore(GEOCODE_CONCURRENCY)
+_rate_lock = asyncio.Lock()
+_next_call_at = 0.0
+
+# Cached marker for addresses the upstream could not resolve.
+_MISS = object()
+
+# Any object with geopy-style geocode()/reverse() methods can stand in for
+# Nominatim, e.g. a local stub in tests.
+def set_geocoder(geocoder):
+    global _geocoder
+    _geocoder = geocoder
+    _memory_cache.clear()
+
+_memory_cache = TTLCache(GEOCODE_CACHE_SIZE, GEOCODE_CACHE_TTL_SECONDS)
+
+def normalize_address(address: str) -> str:
+    return re.sub(r"\s+", " ", address).strip().lower()
+
+def geocode_key(address: str) -> str:
+    return f"geocode:{normalize_address(address)}"
+
+def reverse_key(lat: float, lon: float) -> str:
+    return f"reverse:{lat:.{REVERSE_GEOCODE_PRECISION}f},{lon:.{REVERSE_GEOCODE_PRECISION}f}"
+
+async def _wait_for_rate_limit():
+    # Nominatim's usage policy allows one request per second across the service.
+    global _next_call_at
+    async with _rate_lock:
+        delay = _next_call_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        _next_call_at = time.monotonic() + GEOCODE_MIN_INTERVAL_SECONDS
+
+def _remember(key: str, value: Optional[dict], ttl_seconds: int):
+    _memory_cache.set(key, _MISS if value is None else value, time.time() + ttl_seconds)
+
+async def _cached(key: str, lookup) -> Optional[dict]:
+    value = _memory_cache.get(key)
+    if value is _MISS:
+        return None
+    if value is not None:
+        return value
+
+    cached = await geocode_cache_collection.find_one({"_id": key})
+    if cached:
+        ttl_seconds = GEOCODE_CACHE_TTL_SECONDS if cached["value"] is not None else GEOCODE_NEGATIVE_CACHE_TTL_SECONDS
+        _remember(key, cached["value"], ttl_seconds)
+        return cached["value"]
+
+    async with _semaphore:
+        await _wait_for_rate_limit()
+        started = time.perf_counter()
+        value = await asyncio.to_thread(lookup)
+        logger.info(f"Upstream geocoder call for {key} took {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    # Misses are cached too, for a shorter time, so bad addresses don't keep hitting the upstream.
+    ttl_seconds = GEOCODE_CACHE_TTL_SECONDS if value is not None else GEOCODE_NEGATIVE_CACHE_TTL_SECONDS
+    _remember(key, value, ttl_seconds)
+    await geocode_cache_collection.update_one(
+        {"_id": key},
+        {
+            "$set": {
+                "value": value,
+                "expires_at": datetime.utcnow() + timedelta(seconds=ttl_seconds)
+            }
+        },
+        upsert=True
+    )
+    return value
+
+async def geocode(address: str) -> Optional[dict]:
+    def lookup():
+        location = _geocoder.geocode(address)
+        if not location:
+            return None
+        return {
+            "lat": location.latitude,
+            "lon": location.longitude,
+            "display_name": location.address
+        }
+
+    return await _cached(geocode_key(address), lookup)
+
+async def reverse(lat: float, lon: float) -> Optional[dict]:
+    def lookup():
+        location = _geocoder.reverse(f"{lat}, {lon}")
+        if not location:
+            return None
+        return {"address": location.address}
+
+    return await _cached(reverse_key(lat, lon), lookup)
\ No newline at end of file
@@ -0,0 +1,24 @@
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from common import mongo_indexes
+from database import geocode_cache_collection, municipalities_collection
+
+INDEXES = [
+    (geocode_cache_collection, [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ]),
+    (municipalities_collection, [
+        IndexModel([("boundary_updated_at", DESCENDING)], name="boundary_updated_at", sparse=True),
+    ]),
+]
+
+ROUTE_QUERIES = [
+    ("POST /geo/geocode", geocode_cache_collection, {"_id": "geocode:address"}, None),
+    ("POST /geo/reverse-geocode", geocode_cache_collection, {"_id": "reverse:0.0000,0.0000"}, None),
+    ("locator refresh", municipalities_collection, {"boundary_updated_at": {"$exists": True}}, [("boundary_updated_at", DESCENDING)]),
+]
+
+async def ensure_indexes():
+    await mongo_indexes.ensure_indexes(INDEXES)
+
+async def check_indexes() -> bool:
+    return await mongo_indexes.check_indexes(ROUTE_QUERIES)
\ No newline at end of file
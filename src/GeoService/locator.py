@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+from database import municipalities_collection
+from config import LOCATOR_CELL_DEGREES, LOCATOR_REFRESH_SECONDS
+from spatial import GridIndex, Region, geometry_polygons
+
+logger = logging.getLogger(__name__)
+
+_index = GridIndex([], LOCATOR_CELL_DEGREES)
+_version = None
+_refresher: Optional[asyncio.Task] = None
+
+async def _boundaries_version():
+    count = await municipalities_collection.count_documents({"boundary": {"$ne": None}})
+    latest = await municipalities_collection.find_one(
+        {"boundary_updated_at": {"$exists": True}},
+        {"boundary_updated_at": 1},
+        sort=[("boundary_updated_at", -1)]
+    )
+    return count, latest["boundary_updated_at"] if latest else None
+
+async def load_index():
+    global _index, _version
+    started = time.perf_counter()
+    version = await _boundaries_version()
+
+    regions = []
+    async for municipality in municipalities_collection.find(
+        {"boundary": {"$ne": None}},
+        {"name": 1, "boundary": 1}
+    ):
+        try:
+            polygons = geometry_polygons(municipality["boundary"])
+            region = Region(str(municipality["_id"]), municipality["name"], polygons)
+        except (ValueError, TypeError, KeyError, IndexError) as e:
+            logger.warning(f"Skipping boundary of municipality {municipality['_id']}: {str(e)}")
+            continue
+        regions.append(region)
+
+    _index = GridIndex(regions, LOCATOR_CELL_DEGREES)
+    _version = version
+    elapsed = (time.perf_counter() - started) * 1000
+    logger.info(f"Loaded {len(regions)} municipality boundaries in {elapsed:.1f}ms")
+
+async def refresh_if_changed():
+    if await _boundaries_version() != _version:
+        await load_index()
+
+async def _refresh_loop():
+    while True:
+        await asyncio.sleep(LOCATOR_REFRESH_SECONDS)
+        try:
+            await refresh_if_changed()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to refresh municipality boundaries: {str(e)}")
+
+async def start_locator():
+    global _refresher
+    try:
+        await load_index()
+    except Exception as e:
+        logger.error(f"Failed to load municipality boundaries: {str(e)}")
+    _refresher = asyncio.create_task(_refresh_loop())
+
+async def stop_locator():
+    global _refresher
+    if _refresher:
+        _refresher.cancel()
+        try:
+            await _refresher
+        except asyncio.CancelledError:
+            pass
+        _refresher = None
+
+def locate(lat: float, lon: float) -> Optional[Region]:
+    return _index.locate(lon, lat)
\ No newline at end of file
@@ -4,6 +4,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from routes import router
+from indexes import ensure_indexes, check_indexes
+from locator import start_locator, stop_locator
 
 load_dotenv()
 
@@ -37,12 +39,24 @@ async def health_check():
 @app.on_event("startup")
 async def startup_event():
     logger.info("Geo Service starting up...")
+    await ensure_indexes()
+    await start_locator()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Geo Service shutting down...")
+    await stop_locator()
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--check-indexes", action="store_true", help="explain every route query and report collection scans")
+    args = parser.parse_args()
+    
+    if args.check_indexes:
+        import asyncio
+        raise SystemExit(0 if asyncio.run(check_indexes()) else 1)
+    
     import uvicorn
     port = int(os.getenv("PORT", 8005))
     uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)
\ No newline at end of file
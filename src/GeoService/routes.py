@@ -1,15 +1,14 @@
 from fastapi import APIRouter, HTTPException, status
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
-from geopy.geocoders import Nominatim
 from database import municipalities_collection
+import geocoding
+import locator
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-geolocator = Nominatim(user_agent="cityfix_geoservice")
-
 class GeocodeRequest(BaseModel):
     address: str
 
@@ -29,6 +28,22 @@ class ReverseGeocodeResponse(BaseModel):
     lat: float
     lon: float
 
+class LocateRequest(BaseModel):
+    lat: float = Field(ge=-90, le=90)
+    lon: float = Field(ge=-180, le=180)
+
+class LocateResponse(BaseModel):
+    municipality_id: str
+    name: str
+    lat: float
+    lon: float
+
+class BatchLocateRequest(BaseModel):
+    points: List[LocateRequest] = Field(min_length=1, max_length=1000)
+
+class BatchLocateResponse(BaseModel):
+    results: List[Optional[LocateResponse]]
+
 class BoundaryResponse(BaseModel):
     municipality_id: str
     name: str
@@ -39,52 +54,52 @@ async def geocode_address(request: GeocodeRequest):
     logger.info(f"Geocoding address: {request.address}")
     
     try:
-        location = geolocator.geocode(request.address)
-        
-        if not location:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Address not found"
-            )
-        
-        return GeocodeResponse(
-            lat=location.latitude,
-            lon=location.longitude,
-            address=request.address,
-            display_name=location.address
-        )
+        location = await geocoding.geocode(request.address)
     except Exception as e:
         logger.error(f"Geocoding error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Geocoding service error"
         )
+    
+    if not location:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Address not found"
+        )
+    
+    return GeocodeResponse(
+        lat=location["lat"],
+        lon=location["lon"],
+        address=request.address,
+        display_name=location["display_name"]
+    )
 
 @router.post("/reverse-geocode", response_model=ReverseGeocodeResponse)
 async def reverse_geocode(request: ReverseGeocodeRequest):
     logger.info(f"Reverse geocoding: {request.lat}, {request.lon}")
     
     try:
-        location = geolocator.reverse(f"{request.lat}, {request.lon}")
-        
-        if not location:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Location not found"
-            )
-        
-        return ReverseGeocodeResponse(
-            address=location.address,
-            display_name=location.address,
-            lat=request.lat,
-            lon=request.lon
-        )
+        location = await geocoding.reverse(request.lat, request.lon)
     except Exception as e:
         logger.error(f"Reverse geocoding error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Reverse geocoding service error"
         )
+    
+    if not location:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Location not found"
+        )
+    
+    return ReverseGeocodeResponse(
+        address=location["address"],
+        display_name=location["address"],
+        lat=request.lat,
+        lon=request.lon
+    )
 
 @router.get("/map/tiles")
 async def get_map_tiles():
@@ -99,7 +114,7 @@ async def get_boundaries():
     logger.info("Fetching municipality boundaries")
     
     boundaries = []
-    async for municipality in municipalities_collection.find():
+    async for municipality in municipalities_collection.find({}, {"name": 1, "bounds": 1}):
         boundary = BoundaryResponse(
             municipality_id=str(municipality["_id"]),
             name=municipality["name"],
@@ -107,4 +122,30 @@ async def get_boundaries():
         )
         boundaries.append(boundary)
     
-    return boundaries
\ No newline at end of file
+    return boundaries
+
+def _locate(point: LocateRequest) -> Optional[LocateResponse]:
+    region = locator.locate(point.lat, point.lon)
+    if not region:
+        return None
+    return LocateResponse(municipality_id=region.key, name=region.value, lat=point.lat, lon=point.lon)
+
+@router.post("/locate", response_model=LocateResponse)
+async def locate_point(request: LocateRequest):
+    match = _locate(request)
+    if not match:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No municipality contains this location"
+        )
+    return match
+
+@router.post("/locate/batch", response_model=BatchLocateResponse)
+async def locate_points(request: BatchLocateRequest):
+    logger.info(f"Locating {len(request.points)} points")
+    return BatchLocateResponse(results=[_locate(point) for point in request.points])
+
+@router.post("/boundaries/reload")
+async def reload_boundaries():
+    await locator.refresh_if_changed()
+    return {"status": "ok"}
\ No newline at end of file
@@ -0,0 +1,83 @@
+import math
+from collections import defaultdict
+from typing import List, Optional, Tuple
+
+Ring = List[Tuple[float, float]]
+
+def point_in_ring(lon: float, lat: float, ring: Ring) -> bool:
+    inside = False
+    j = len(ring) - 1
+    for i in range(len(ring)):
+        xi, yi = ring[i]
+        xj, yj = ring[j]
+        if (yi > lat) != (yj > lat) and lon < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+def point_in_polygons(lon: float, lat: float, polygons: List[List[Ring]]) -> bool:
+    for rings in polygons:
+        if point_in_ring(lon, lat, rings[0]) and not any(point_in_ring(lon, lat, hole) for hole in rings[1:]):
+            return True
+    return False
+
+def geometry_polygons(geometry: dict) -> List[List[Ring]]:
+    if geometry.get("type") == "Polygon":
+        polygons = [geometry["coordinates"]]
+    elif geometry.get("type") == "MultiPolygon":
+        polygons = geometry["coordinates"]
+    else:
+        raise ValueError(f"Unsupported geometry type: {geometry.get('type')}")
+    return [[[(float(x), float(y)) for x, y, *_ in ring] for ring in polygon] for polygon in polygons]
+
+class Region:
+    __slots__ = ("key", "value", "polygons", "min_lon", "min_lat", "max_lon", "max_lat")
+
+    def __init__(self, key, value, polygons: List[List[Ring]]):
+        self.key = key
+        self.value = value
+        self.polygons = polygons
+        outer = [point for rings in polygons for point in rings[0]]
+        self.min_lon = min(x for x, _ in outer)
+        self.max_lon = max(x for x, _ in outer)
+        self.min_lat = min(y for _, y in outer)
+        self.max_lat = max(y for _, y in outer)
+
+    @property
+    def area(self) -> float:
+        return (self.max_lon - self.min_lon) * (self.max_lat - self.min_lat)
+
+    def contains(self, lon: float, lat: float) -> bool:
+        if not (self.min_lon <= lon <= self.max_lon and self.min_lat <= lat <= self.max_lat):
+            return False
+        return point_in_polygons(lon, lat, self.polygons)
+
+class GridIndex:
+    def __init__(self, regions: List[Region], cell_degrees: float, max_cells_per_region: int = 4096):
+        self.cell_degrees = cell_degrees
+        self._cells = defaultdict(list)
+        self._oversized: List[Region] = []
+        self.size = len(regions)
+
+        # Smallest regions first, so an enclave wins over the region around it.
+        for region in sorted(regions, key=lambda r: r.area):
+            x0, y0 = self._cell(region.min_lon, region.min_lat)
+            x1, y1 = self._cell(region.max_lon, region.max_lat)
+            if (x1 - x0 + 1) * (y1 - y0 + 1) > max_cells_per_region:
+                self._oversized.append(region)
+                continue
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    self._cells[(x, y)].append(region)
+
+    def _cell(self, lon: float, lat: float) -> Tuple[int, int]:
+        return math.floor(lon / self.cell_degrees), math.floor(lat / self.cell_degrees)
+
+    def locate(self, lon: float, lat: float) -> Optional[Region]:
+        for region in self._cells.get(self._cell(lon, lat), ()):
+            if region.contains(lon, lat):
+                return region
+        for region in self._oversized:
+            if region.contains(lon, lat):
+                return region
+        return None
\ No newline at end of file
@@ -5,6 +5,13 @@ load_dotenv()
 
 UPLOAD_DIR = os.getenv("UPLOAD_DIR", "/app/uploads")
 MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", "10485760"))
+MULTIPART_OVERHEAD = int(os.getenv("MULTIPART_OVERHEAD", "65536"))
+MEDIA_CACHE_MAX_AGE = int(os.getenv("MEDIA_CACHE_MAX_AGE", "31536000"))
+THUMBNAIL_SIZE = int(os.getenv("THUMBNAIL_SIZE", "320"))
+MEDIUM_SIZE = int(os.getenv("MEDIUM_SIZE", "1280"))
+WEBP_QUALITY = int(os.getenv("WEBP_QUALITY", "80"))
+DERIVATIVE_WORKERS = int(os.getenv("DERIVATIVE_WORKERS", "2"))
+BLOB_DELETE_CLAIM_TIMEOUT = int(os.getenv("BLOB_DELETE_CLAIM_TIMEOUT", "30"))
 ALLOWED_EXTENSIONS = {"jpg", "jpeg", "png", "gif", "webp"}
 
 os.makedirs(UPLOAD_DIR, exist_ok=True)
\ No newline at end of file
@@ -10,6 +10,7 @@ client = AsyncIOMotorClient(MONGODB_URL)
 db = client.cityfix
 
 media_collection = db.media
+media_blobs_collection = db.media_blobs
 
 async def get_database():
     return db
\ No newline at end of file
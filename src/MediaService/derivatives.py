@@ -0,0 +1,132 @@
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+import aiofiles.os
+from PIL import Image, ImageOps
+from database import media_collection, media_blobs_collection
+from config import UPLOAD_DIR, THUMBNAIL_SIZE, MEDIUM_SIZE, WEBP_QUALITY, DERIVATIVE_WORKERS
+from storage import link_blob, release_blob
+
+logger = logging.getLogger(__name__)
+
+VARIANTS = {
+    "thumb": THUMBNAIL_SIZE,
+    "medium": MEDIUM_SIZE,
+}
+
+_pool: Optional[ProcessPoolExecutor] = None
+_tasks = set()
+
+def derivative_filename(sha256: str, variant: str) -> str:
+    return os.path.join("derivatives", sha256[:2], f"{sha256}-{variant}.webp")
+
+def render_variants(upload_dir: str, stored_filename: str, sha256: str) -> dict:
+    variants = {}
+    with Image.open(os.path.join(upload_dir, stored_filename)) as source:
+        image = ImageOps.exif_transpose(source)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+        for variant, max_size in VARIANTS.items():
+            resized = image.copy()
+            resized.thumbnail((max_size, max_size))
+            filename = derivative_filename(sha256, variant)
+            path = os.path.join(upload_dir, filename)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            resized.save(path, "WEBP", quality=WEBP_QUALITY)
+            variants[variant] = {
+                "stored_filename": filename,
+                "width": resized.width,
+                "height": resized.height,
+                "size": os.path.getsize(path)
+            }
+    return variants
+
+def start_pool():
+    global _pool
+    # Forking after Motor has started its threads can deadlock the children
+    _pool = ProcessPoolExecutor(max_workers=DERIVATIVE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+def stop_pool():
+    global _pool
+    if _pool:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+
+async def generate_derivatives(sha256: str, stored_filename: str):
+    loop = asyncio.get_running_loop()
+    try:
+        variants = await loop.run_in_executor(_pool, render_variants, UPLOAD_DIR, stored_filename, sha256)
+    except Exception as e:
+        logger.error(f"Failed to render derivatives for blob {sha256}: {str(e)}")
+        return
+
+    result = await media_blobs_collection.update_one({"_id": sha256, "deleting_at": None}, {"$set": {"variants": variants}})
+    if result.matched_count == 0:
+        for variant in variants.values():
+            await aiofiles.os.remove(os.path.join(UPLOAD_DIR, variant["stored_filename"]))
+        return
+    logger.info(f"Rendered derivatives for blob {sha256}")
+
+def schedule_derivatives(sha256: str, stored_filename: str):
+    task = asyncio.create_task(generate_derivatives(sha256, stored_filename))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _stage_copy(source: str, destination: str):
+    if os.path.exists(destination):
+        os.remove(destination)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
+async def _adopt_legacy_file(media_doc: dict):
+    legacy_path = os.path.join(UPLOAD_DIR, media_doc["stored_filename"])
+    if not await aiofiles.os.path.exists(legacy_path):
+        logger.warning(f"Skipping {media_doc['file_id']}: file missing on disk")
+        return
+    
+    sha256 = await asyncio.to_thread(_hash_file, legacy_path)
+    # link_blob consumes its source, so hand it a second link and keep the
+    # legacy file until the media document points at the blob.
+    staged_path = f"{legacy_path}.adopt"
+    await asyncio.to_thread(_stage_copy, legacy_path, staged_path)
+    stored_filename, _ = await link_blob(sha256, staged_path, media_doc.get("size"))
+    
+    try:
+        await media_collection.update_one(
+            {"_id": media_doc["_id"]},
+            {"$set": {"sha256": sha256, "stored_filename": stored_filename}}
+        )
+    except Exception:
+        await release_blob(sha256)
+        raise
+    await aiofiles.os.remove(legacy_path)
+    logger.info(f"Moved {media_doc['file_id']} into blob {sha256}")
+
+async def backfill():
+    start_pool()
+    try:
+        async for media_doc in media_collection.find({"sha256": {"$exists": False}}):
+            await _adopt_legacy_file(media_doc)
+        
+        batch = []
+        async for blob in media_blobs_collection.find({"variants": {"$exists": False}}):
+            batch.append(generate_derivatives(blob["_id"], blob["stored_filename"]))
+            if len(batch) >= DERIVATIVE_WORKERS:
+                await asyncio.gather(*batch)
+                batch = []
+        await asyncio.gather(*batch)
+    finally:
+        stop_pool()
\ No newline at end of file
@@ -0,0 +1,75 @@
+import re
+from typing import Optional, Tuple
+import aiofiles
+import aiofiles.os
+from fastapi import Request, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
+from config import MEDIA_CACHE_MAX_AGE
+
+CHUNK_SIZE = 64 * 1024
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+def parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    match = RANGE_PATTERN.match(range_header.strip())
+    if not match or match.groups() == ("", ""):
+        raise ValueError("Unsupported range")
+    start, end = match.groups()
+    if start == "":
+        length = int(end)
+        if length == 0:
+            return None
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return None
+    return start, end
+
+async def _iter_range(path: str, start: int, end: int):
+    async with aiofiles.open(path, "rb") as f:
+        await f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+def _etag_matches(header: str, etag: str) -> bool:
+    candidates = [value.strip() for value in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+async def file_response(request: Request, path: str, media_type: str, filename: str, etag: str, immutable: bool = True) -> Response:
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={MEDIA_CACHE_MAX_AGE}, immutable" if immutable else "no-cache",
+        "Accept-Ranges": "bytes",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range == etag):
+        size = (await aiofiles.os.stat(path)).st_size
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            return FileResponse(path, media_type=media_type, filename=filename, headers=headers)
+        if byte_range is None:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, headers=headers)
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(
+            _iter_range(path, start, end),
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            media_type=media_type,
+            headers=headers
+        )
+
+    return FileResponse(path, media_type=media_type, filename=filename, headers=headers)
\ No newline at end of file
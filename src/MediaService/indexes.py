@@ -0,0 +1,20 @@
+from pymongo import ASCENDING, IndexModel
+from common import mongo_indexes
+from database import media_collection
+
+INDEXES = [
+    (media_collection, [
+        IndexModel([("file_id", ASCENDING)], name="file_id_unique", unique=True),
+    ]),
+]
+
+ROUTE_QUERIES = [
+    ("GET /media/{file_id}", media_collection, {"file_id": "file"}, None),
+    ("DELETE /media/{file_id}", media_collection, {"file_id": "file"}, None),
+]
+
+async def ensure_indexes():
+    await mongo_indexes.ensure_indexes(INDEXES)
+
+async def check_indexes() -> bool:
+    return await mongo_indexes.check_indexes(ROUTE_QUERIES)
\ No newline at end of file
@@ -4,6 +4,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from routes import router
+from indexes import ensure_indexes, check_indexes
+from derivatives import start_pool, stop_pool, backfill
 
 load_dotenv()
 
@@ -37,12 +39,30 @@ async def health_check():
 @app.on_event("startup")
 async def startup_event():
     logger.info("Media Service starting up...")
+    await ensure_indexes()
+    start_pool()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Media Service shutting down...")
+    stop_pool()
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--check-indexes", action="store_true", help="explain every route query and report collection scans")
+    parser.add_argument("--backfill-derivatives", action="store_true", help="move existing uploads into blob storage and render missing derivatives")
+    args = parser.parse_args()
+    
+    if args.check_indexes:
+        import asyncio
+        raise SystemExit(0 if asyncio.run(check_indexes()) else 1)
+    
+    if args.backfill_derivatives:
+        import asyncio
+        asyncio.run(backfill())
+        raise SystemExit(0)
+    
     import uvicorn
     port = int(os.getenv("PORT", 8004))
     uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)
\ No newline at end of file
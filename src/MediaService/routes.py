@@ -1,78 +1,67 @@
-from fastapi import APIRouter, HTTPException, status, UploadFile, File, Query
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, status, Request, Query
 from datetime import datetime
-from bson import ObjectId
 import os
 import uuid
-from database import media_collection
-from config import UPLOAD_DIR, MAX_FILE_SIZE, ALLOWED_EXTENSIONS
+import aiofiles.os
+from database import media_collection, media_blobs_collection
+from config import UPLOAD_DIR
+from upload import receive_upload
+from download import file_response
+from storage import link_blob, release_blob
+from derivatives import schedule_derivatives, VARIANTS
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-def get_file_extension(filename: str) -> str:
-    return filename.split(".")[-1].lower() if "." in filename else ""
-
 @router.post("/upload")
 async def upload_file(
-    file: UploadFile = File(...),
+    request: Request,
     ticket_id: str = Query(None),
     user_id: str = Query(...)
 ):
-    logger.info(f"Uploading file: {file.filename}")
-    
-    if not file.filename:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No filename provided"
-        )
-    
-    file_extension = get_file_extension(file.filename)
-    if file_extension not in ALLOWED_EXTENSIONS:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
-        )
-    
-    contents = await file.read()
-    if len(contents) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-            detail=f"File too large. Max size: {MAX_FILE_SIZE} bytes"
-        )
+    upload = await receive_upload(request)
+    logger.info(f"Uploaded file: {upload.filename} ({upload.size} bytes)")
     
     file_id = str(uuid.uuid4())
-    file_name = f"{file_id}.{file_extension}"
-    file_path = os.path.join(UPLOAD_DIR, file_name)
-    
-    with open(file_path, "wb") as f:
-        f.write(contents)
+    stored_filename, created = await link_blob(upload.sha256, upload.temp_path, upload.size)
+    if created:
+        schedule_derivatives(upload.sha256, stored_filename)
     
     media_doc = {
         "file_id": file_id,
-        "filename": file.filename,
-        "stored_filename": file_name,
+        "filename": upload.filename,
+        "stored_filename": stored_filename,
+        "sha256": upload.sha256,
         "url": f"/media/{file_id}",
         "ticket_id": ticket_id,
         "uploaded_by": user_id,
-        "size": len(contents),
-        "content_type": file.content_type,
+        "size": upload.size,
+        "content_type": upload.content_type,
         "created_at": datetime.utcnow()
     }
     
-    await media_collection.insert_one(media_doc)
+    try:
+        await media_collection.insert_one(media_doc)
+    except Exception:
+        # Nothing points at the blob yet, so drop the reference taken above
+        await release_blob(upload.sha256)
+        raise
     
     return {
         "file_id": file_id,
-        "filename": file.filename,
+        "filename": upload.filename,
         "url": f"/media/{file_id}",
-        "size": len(contents)
+        "size": upload.size
     }
 
 @router.get("/{file_id}")
-async def get_file(file_id: str):
-    logger.info(f"Retrieving file: {file_id}")
+async def get_file(
+    file_id: str,
+    request: Request,
+    size: str = Query("original", pattern="^(thumb|medium|original)$")
+):
+    logger.info(f"Retrieving file: {file_id} ({size})")
     
     media_doc = await media_collection.find_one({"file_id": file_id})
     
@@ -82,18 +71,46 @@ async def get_file(file_id: str):
             detail="File not found"
         )
     
-    file_path = os.path.join(UPLOAD_DIR, media_doc["stored_filename"])
-    
-    if not os.path.exists(file_path):
+    stored_filename = media_doc["stored_filename"]
+    media_type = media_doc.get("content_type", "application/octet-stream")
+    filename = media_doc["filename"]
+    etag = media_doc.get("sha256", file_id)
+    immutable = True
+    
+    if size in VARIANTS:
+        variant = None
+        if media_doc.get("sha256"):
+            blob = await media_blobs_collection.find_one(
+                {"_id": media_doc["sha256"]},
+                {f"variants.{size}": 1}
+            )
+            variant = (blob or {}).get("variants", {}).get(size)
+        if variant:
+            stored_filename = variant["stored_filename"]
+            media_type = "image/webp"
+            filename = f"{os.path.splitext(filename)[0]}-{size}.webp"
+            etag = f"{etag}-{size}"
+        else:
+            # The derivative is not rendered yet: serve the original, but keep
+            # caches from pinning it under the variant URL.
+            etag = f"{etag}-{size}-pending"
+            immutable = False
+    
+    file_path = os.path.join(UPLOAD_DIR, stored_filename)
+    
+    if not await aiofiles.os.path.exists(file_path):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="File not found on disk"
         )
     
-    return FileResponse(
+    return await file_response(
+        request,
         file_path,
-        media_type=media_doc.get("content_type", "application/octet-stream"),
-        filename=media_doc["filename"]
+        media_type=media_type,
+        filename=filename,
+        etag=f'"{etag}"',
+        immutable=immutable
     )
 
 @router.delete("/{file_id}")
@@ -108,11 +125,13 @@ async def delete_file(file_id: str):
             detail="File not found"
         )
     
-    file_path = os.path.join(UPLOAD_DIR, media_doc["stored_filename"])
-    
-    if os.path.exists(file_path):
-        os.remove(file_path)
+    result = await media_collection.delete_one({"file_id": file_id})
     
-    await media_collection.delete_one({"file_id": file_id})
+    if result.deleted_count and media_doc.get("sha256"):
+        await release_blob(media_doc["sha256"])
+    elif result.deleted_count:
+        file_path = os.path.join(UPLOAD_DIR, media_doc["stored_filename"])
+        if await aiofiles.os.path.exists(file_path):
+            await aiofiles.os.remove(file_path)
     
     return {"message": "File deleted successfully"}
\ No newline at end of file
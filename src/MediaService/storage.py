@@ -0,0 +1,81 @@
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Tuple
+import aiofiles.os
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from database import media_blobs_collection
+from config import UPLOAD_DIR, BLOB_DELETE_CLAIM_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+CLAIM_POLL_INTERVAL = 0.05
+
+def blob_filename(sha256: str) -> str:
+    return os.path.join("blobs", sha256[:2], sha256)
+
+async def link_blob(sha256: str, source_path: str, size: int) -> Tuple[str, bool]:
+    stored_filename = blob_filename(sha256)
+    blob_path = os.path.join(UPLOAD_DIR, stored_filename)
+    
+    while True:
+        try:
+            previous = await media_blobs_collection.find_one_and_update(
+                {"_id": sha256, "deleting_at": None},
+                {
+                    "$inc": {"ref_count": 1},
+                    "$setOnInsert": {
+                        "stored_filename": stored_filename,
+                        "size": size,
+                        "created_at": datetime.utcnow()
+                    }
+                },
+                upsert=True,
+                return_document=ReturnDocument.BEFORE
+            )
+            break
+        except DuplicateKeyError:
+            # release_blob has claimed this blob and is removing its files; wait
+            # for it to drop the document, or take over a claim left by a crash.
+            await media_blobs_collection.delete_one({
+                "_id": sha256,
+                "deleting_at": {"$lt": datetime.utcnow() - timedelta(seconds=BLOB_DELETE_CLAIM_TIMEOUT)}
+            })
+            await asyncio.sleep(CLAIM_POLL_INTERVAL)
+    
+    if previous and await aiofiles.os.path.exists(blob_path):
+        logger.info(f"Deduplicated {source_path} onto blob {sha256}")
+        await aiofiles.os.remove(source_path)
+        return stored_filename, False
+    
+    await aiofiles.os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+    await aiofiles.os.replace(source_path, blob_path)
+    return stored_filename, True
+
+async def release_blob(sha256: str):
+    blob = await media_blobs_collection.find_one_and_update(
+        {"_id": sha256},
+        {"$inc": {"ref_count": -1}},
+        return_document=ReturnDocument.AFTER
+    )
+    if not blob or blob["ref_count"] > 0:
+        return
+    
+    blob = await media_blobs_collection.find_one_and_update(
+        {"_id": sha256, "ref_count": {"$lte": 0}, "deleting_at": None},
+        {"$set": {"deleting_at": datetime.utcnow()}},
+        return_document=ReturnDocument.AFTER
+    )
+    if not blob:
+        return
+    
+    filenames = [blob["stored_filename"]]
+    filenames += [variant["stored_filename"] for variant in blob.get("variants", {}).values()]
+    for filename in filenames:
+        path = os.path.join(UPLOAD_DIR, filename)
+        if await aiofiles.os.path.exists(path):
+            await aiofiles.os.remove(path)
+    await media_blobs_collection.delete_one({"_id": sha256, "deleting_at": blob["deleting_at"]})
+    logger.info(f"Removed unreferenced blob {sha256}")
\ No newline at end of file
@@ -0,0 +1,157 @@
+import hashlib
+import os
+import uuid
+import aiofiles
+import aiofiles.os
+from fastapi import HTTPException, Request, status
+from multipart.multipart import MultipartParser, parse_options_header
+from config import UPLOAD_DIR, MAX_FILE_SIZE, ALLOWED_EXTENSIONS, MULTIPART_OVERHEAD
+
+def get_file_extension(filename: str) -> str:
+    return filename.split(".")[-1].lower() if "." in filename else ""
+
+class UploadTooLarge(Exception):
+    pass
+
+class StreamedUpload:
+    def __init__(self, field_name: str):
+        self.field_name = field_name
+        self.filename = None
+        self.content_type = None
+        self.extension = None
+        self.size = 0
+        self.temp_path = os.path.join(UPLOAD_DIR, f".{uuid.uuid4()}.part")
+        self._file = None
+        self._in_file_part = False
+        self._headers = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._chunks = []
+        self._file_pending = False
+        self._hash = hashlib.sha256()
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self._on_part_begin,
+            "on_part_data": self._on_part_data,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+        }
+
+    def _on_part_begin(self):
+        self._headers = {}
+        self._in_file_part = False
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if options.get(b"name", b"").decode() != self.field_name or b"filename" not in options:
+            return
+        if self.filename is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Only one file can be uploaded per request"
+            )
+        self._in_file_part = True
+        self.filename = options[b"filename"].decode("utf-8", errors="replace")
+        self.content_type = self._headers.get(b"content-type", b"application/octet-stream").decode()
+        self.extension = get_file_extension(self.filename)
+        self._file_pending = True
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        if not self._in_file_part:
+            return
+        self.size += end - start
+        if self.size > MAX_FILE_SIZE:
+            raise UploadTooLarge()
+        self._chunks.append(data[start:end])
+
+    async def _start_file(self):
+        if not self.filename:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="No filename provided"
+            )
+        if self.extension not in ALLOWED_EXTENSIONS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File type not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
+            )
+        self._file = await aiofiles.open(self.temp_path, "wb")
+
+    async def flush(self):
+        if self._file_pending:
+            self._file_pending = False
+            await self._start_file()
+        if self._chunks and self._file:
+            data = b"".join(self._chunks)
+            self._hash.update(data)
+            await self._file.write(data)
+        self._chunks.clear()
+
+    async def close(self):
+        if self._file:
+            await self._file.close()
+            self._file = None
+
+    async def discard(self):
+        await self.close()
+        if await aiofiles.os.path.exists(self.temp_path):
+            await aiofiles.os.remove(self.temp_path)
+
+async def receive_upload(request: Request, field_name: str = "file") -> StreamedUpload:
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or b"boundary" not in params:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Expected a multipart/form-data upload"
+        )
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_FILE_SIZE + MULTIPART_OVERHEAD:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large. Max size: {MAX_FILE_SIZE} bytes"
+        )
+
+    upload = StreamedUpload(field_name)
+    parser = MultipartParser(params[b"boundary"], upload.callbacks())
+    try:
+        async for chunk in request.stream():
+            parser.write(chunk)
+            await upload.flush()
+        parser.finalize()
+        await upload.flush()
+    except UploadTooLarge:
+        await upload.discard()
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large. Max size: {MAX_FILE_SIZE} bytes"
+        )
+    except BaseException:
+        await upload.discard()
+        raise
+    await upload.close()
+
+    if upload.filename is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No file provided"
+        )
+    return upload
\ No newline at end of file
@@ -0,0 +1,27 @@
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from common import mongo_indexes
+from database import notifications_collection
+
+NEWEST_FIRST = [("created_at", DESCENDING)]
+
+INDEXES = [
+    (notifications_collection, [
+        IndexModel([("user_id", ASCENDING)] + NEWEST_FIRST, name="user_created_at"),
+        IndexModel([("user_id", ASCENDING), ("read", ASCENDING)] + NEWEST_FIRST, name="user_read_created_at"),
+        IndexModel([("user_id", ASCENDING), ("seq", ASCENDING)], name="user_seq_resume"),
+    ]),
+]
+
+ROUTE_QUERIES = [
+    ("GET /notify/user/{user_id}", notifications_collection, {"user_id": "user"}, NEWEST_FIRST),
+    ("GET /notify/user/{user_id}?unread_only", notifications_collection, {"user_id": "user", "read": False}, NEWEST_FIRST),
+    ("GET /notify/user/{user_id}/unread-count", notifications_collection, {"user_id": "user", "read": False}, None),
+    ("PATCH /notify/user/{user_id}/read-all", notifications_collection, {"user_id": "user", "read": False}, None),
+    ("GET /notify/user/{user_id}/stream", notifications_collection, {"user_id": "user", "seq": {"$gt": 0}}, [("seq", ASCENDING)]),
+]
+
+async def ensure_indexes():
+    await mongo_indexes.ensure_indexes(INDEXES)
+
+async def check_indexes() -> bool:
+    return await mongo_indexes.check_indexes(ROUTE_QUERIES)
\ No newline at end of file
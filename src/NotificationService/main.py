@@ -1,9 +1,13 @@
 import os
 import logging
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from routes import router
+from indexes import ensure_indexes, check_indexes
+from stream import start_fanout, stop_fanout
+from outbox import outbox, OutboxFull
 
 load_dotenv()
 
@@ -28,6 +32,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(OutboxFull)
+async def outbox_full_handler(request: Request, exc: OutboxFull):
+    logger.warning(f"Notification outbox full, rejecting {request.url.path}")
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Notification queue full, please retry"},
+        headers={"Retry-After": "1"}
+    )
+
 app.include_router(router, prefix="/notify", tags=["Notifications"])
 
 @app.get("/health")
@@ -37,12 +50,26 @@ async def health_check():
 @app.on_event("startup")
 async def startup_event():
     logger.info("Notification Service starting up...")
+    await ensure_indexes()
+    start_fanout()
+    outbox.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Notification Service shutting down...")
+    await outbox.stop()
+    await stop_fanout()
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--check-indexes", action="store_true", help="explain every route query and report collection scans")
+    args = parser.parse_args()
+    
+    if args.check_indexes:
+        import asyncio
+        raise SystemExit(0 if asyncio.run(check_indexes()) else 1)
+    
     import uvicorn
     port = int(os.getenv("PORT", 8006))
     uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)
\ No newline at end of file
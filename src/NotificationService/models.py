@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 class NotificationCreate(BaseModel):
@@ -19,4 +19,38 @@ class NotificationResponse(BaseModel):
     
     class Config:
         populate_by_name = True
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class NotificationBatchCreate(BaseModel):
+    notifications: List[NotificationCreate] = Field(min_length=1, max_length=1000)
+
+class NotificationIds(BaseModel):
+    ids: List[str] = Field(min_length=1, max_length=1000)
+
+class MarkReadResult(BaseModel):
+    matched_count: int
+    modified_count: int
+
+class UnreadCount(BaseModel):
+    user_id: str
+    unread_count: int
+
+class NotificationQueued(BaseModel):
+    ids: List[str]
+    queued: int
+
+class OutboxMetrics(BaseModel):
+    queue_depth: int
+    queue_capacity: int
+    enqueued: int
+    rejected: int
+    written: int
+    dropped: int
+    batches: int
+    retries: int
+    last_batch_size: int
+    max_batch_size: int
+    avg_batch_size: float
+    last_drain_latency_ms: float
+    max_drain_latency_ms: float
+    avg_drain_latency_ms: float
\ No newline at end of file
@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import List, Optional
+from bson import ObjectId
+from stream import append_notifications
+from config import (
+    OUTBOX_QUEUE_SIZE,
+    OUTBOX_BATCH_SIZE,
+    OUTBOX_ENQUEUE_TIMEOUT,
+    OUTBOX_RETRY_BASE_DELAY,
+    OUTBOX_RETRY_MAX_DELAY,
+    OUTBOX_MAX_RETRIES,
+    OUTBOX_SHUTDOWN_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+class OutboxFull(Exception):
+    pass
+
+class OutboxCounters:
+    def __init__(self):
+        self.enqueued = 0
+        self.rejected = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.retries = 0
+        self.last_batch_size = 0
+        self.max_batch_size = 0
+        self.last_drain_latency_ms = 0.0
+        self.max_drain_latency_ms = 0.0
+        self._total_drain_latency_ms = 0.0
+
+    def record_batch(self, size: int, drain_latency_ms: float):
+        self.batches += 1
+        self.written += size
+        self.last_batch_size = size
+        self.max_batch_size = max(self.max_batch_size, size)
+        self.last_drain_latency_ms = drain_latency_ms
+        self.max_drain_latency_ms = max(self.max_drain_latency_ms, drain_latency_ms)
+        self._total_drain_latency_ms += drain_latency_ms
+
+    def snapshot(self, queue_depth: int, queue_capacity: int) -> dict:
+        return {
+            "queue_depth": queue_depth,
+            "queue_capacity": queue_capacity,
+            "enqueued": self.enqueued,
+            "rejected": self.rejected,
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "retries": self.retries,
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size": self.max_batch_size,
+            "avg_batch_size": round(self.written / self.batches, 2) if self.batches else 0.0,
+            "last_drain_latency_ms": round(self.last_drain_latency_ms, 2),
+            "max_drain_latency_ms": round(self.max_drain_latency_ms, 2),
+            "avg_drain_latency_ms": round(self._total_drain_latency_ms / self.batches, 2) if self.batches else 0.0,
+        }
+
+class NotificationOutbox:
+    def __init__(self, queue_size: int, batch_size: int):
+        self.batch_size = batch_size
+        self.metrics = OutboxCounters()
+        self._queue = asyncio.Queue(maxsize=queue_size)
+        self._space = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+        self._in_flight = 0
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> dict:
+        return self.metrics.snapshot(self.depth, self._queue.maxsize)
+
+    def _free(self) -> int:
+        return self._queue.maxsize - self._queue.qsize()
+
+    async def _wait_for_space(self, count: int) -> bool:
+        if count > self._queue.maxsize:
+            return False
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + OUTBOX_ENQUEUE_TIMEOUT
+        while self._free() < count:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            self._space.clear()
+            try:
+                await asyncio.wait_for(self._space.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    async def enqueue(self, notifications: List[dict]) -> List[dict]:
+        # All or nothing: a batch is only queued once there is room for every
+        # item, so a rejected request can be retried without duplicates.
+        if not await self._wait_for_space(len(notifications)):
+            self.metrics.rejected += len(notifications)
+            raise OutboxFull()
+
+        created_at = datetime.utcnow()
+        enqueued_at = time.perf_counter()
+        queued = [
+            {**notification, "_id": ObjectId(), "read": False, "created_at": created_at}
+            for notification in notifications
+        ]
+        for notification in queued:
+            self._queue.put_nowait((enqueued_at, notification))
+
+        self.metrics.enqueued += len(queued)
+        return queued
+
+    def start(self):
+        self._worker = asyncio.create_task(self._drain())
+
+    async def stop(self):
+        if not self._worker:
+            return
+        if not self._queue.empty():
+            logger.info(f"Flushing {self.depth} queued notifications")
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=OUTBOX_SHUTDOWN_TIMEOUT)
+        except asyncio.TimeoutError:
+            pending = self.depth + self._in_flight
+            self.metrics.dropped += pending
+            logger.error(f"Dropping {pending} queued notifications, not written within {OUTBOX_SHUTDOWN_TIMEOUT}s of shutdown")
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    async def _drain(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            self._space.set()
+            self._in_flight = len(batch)
+            try:
+                await self._write(batch)
+            finally:
+                self._in_flight = 0
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write(self, batch: list):
+        documents = [notification for _, notification in batch]
+        attempt = 0
+        while True:
+            try:
+                await append_notifications(documents)
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                attempt += 1
+                if attempt > OUTBOX_MAX_RETRIES:
+                    self.metrics.dropped += len(documents)
+                    logger.error(f"Dropping {len(documents)} queued notifications after {attempt} attempts: {str(e)}")
+                    return
+                delay = min(OUTBOX_RETRY_BASE_DELAY * 2 ** (attempt - 1), OUTBOX_RETRY_MAX_DELAY)
+                self.metrics.retries += 1
+                logger.warning(f"Outbox batch of {len(documents)} failed (attempt {attempt}), retrying in {delay}s: {str(e)}")
+                await asyncio.sleep(delay)
+
+        drained_at = time.perf_counter()
+        oldest = min(enqueued_at for enqueued_at, _ in batch)
+        self.metrics.record_batch(len(documents), (drained_at - oldest) * 1000)
+
+outbox = NotificationOutbox(OUTBOX_QUEUE_SIZE, OUTBOX_BATCH_SIZE)
\ No newline at end of file
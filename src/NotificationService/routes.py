@@ -1,9 +1,13 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Request, Query, Header
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
-from models import NotificationCreate, NotificationResponse
+from pymongo import ReturnDocument
+from models import NotificationCreate, NotificationResponse, NotificationBatchCreate, NotificationIds, MarkReadResult, UnreadCount, NotificationQueued, OutboxMetrics
 from database import notifications_collection
+from stream import notification_events, append_notifications, valid_resume_token
+from outbox import outbox
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,11 +21,49 @@ async def send_notification(notification: NotificationCreate):
     notification_dict["read"] = False
     notification_dict["created_at"] = datetime.utcnow()
     
-    result = await notifications_collection.insert_one(notification_dict)
-    created_notification = await notifications_collection.find_one({"_id": result.inserted_id})
+    await append_notifications([notification_dict])
     
-    created_notification["_id"] = str(created_notification["_id"])
-    return NotificationResponse(**created_notification)
+    notification_dict["_id"] = str(notification_dict["_id"])
+    return NotificationResponse(**notification_dict)
+
+@router.post("/send-batch", response_model=List[NotificationResponse], status_code=status.HTTP_201_CREATED)
+async def send_notification_batch(batch: NotificationBatchCreate):
+    logger.info(f"Sending batch of {len(batch.notifications)} notifications")
+    
+    created_at = datetime.utcnow()
+    notification_dicts = []
+    for notification in batch.notifications:
+        notification_dict = notification.model_dump()
+        notification_dict["read"] = False
+        notification_dict["created_at"] = created_at
+        notification_dicts.append(notification_dict)
+    
+    await append_notifications(notification_dicts)
+    
+    notifications = []
+    for notification_dict in notification_dicts:
+        notification_dict["_id"] = str(notification_dict["_id"])
+        notifications.append(NotificationResponse(**notification_dict))
+    
+    return notifications
+
+@router.post("/enqueue", response_model=NotificationQueued, status_code=status.HTTP_202_ACCEPTED)
+async def enqueue_notification(notification: NotificationCreate):
+    """At most once: the notification is only held in memory until the outbox writes it, so a crash or redeploy before then loses it. Use /send when it must not be lost."""
+    queued = await outbox.enqueue([notification.model_dump()])
+    return NotificationQueued(ids=[str(n["_id"]) for n in queued], queued=len(queued))
+
+@router.post("/enqueue-batch", response_model=NotificationQueued, status_code=status.HTTP_202_ACCEPTED)
+async def enqueue_notification_batch(batch: NotificationBatchCreate):
+    """At most once, like /enqueue: queued notifications are lost if the service stops before the outbox writes them."""
+    logger.info(f"Queueing batch of {len(batch.notifications)} notifications")
+    
+    queued = await outbox.enqueue([notification.model_dump() for notification in batch.notifications])
+    return NotificationQueued(ids=[str(n["_id"]) for n in queued], queued=len(queued))
+
+@router.get("/outbox/metrics", response_model=OutboxMetrics)
+async def get_outbox_metrics():
+    return OutboxMetrics(**outbox.stats())
 
 @router.get("/user/{user_id}", response_model=List[NotificationResponse])
 async def get_user_notifications(user_id: str, unread_only: bool = False):
@@ -38,6 +80,63 @@ async def get_user_notifications(user_id: str, unread_only: bool = False):
     
     return notifications
 
+@router.get("/user/{user_id}/unread-count", response_model=UnreadCount)
+async def get_unread_count(user_id: str):
+    unread_count = await notifications_collection.count_documents({"user_id": user_id, "read": False})
+    return UnreadCount(user_id=user_id, unread_count=unread_count)
+
+@router.patch("/user/{user_id}/read-all", response_model=MarkReadResult)
+async def mark_all_as_read(user_id: str):
+    logger.info(f"Marking all notifications as read for user: {user_id}")
+    
+    result = await notifications_collection.update_many(
+        {"user_id": user_id, "read": False},
+        {"$set": {"read": True}}
+    )
+    
+    return MarkReadResult(matched_count=result.matched_count, modified_count=result.modified_count)
+
+@router.patch("/user/{user_id}/read", response_model=MarkReadResult)
+async def mark_many_as_read(user_id: str, notification_ids: NotificationIds):
+    logger.info(f"Marking {len(notification_ids.ids)} notifications as read for user: {user_id}")
+    
+    try:
+        obj_ids = [ObjectId(notification_id) for notification_id in notification_ids.ids]
+    except:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid notification ID format"
+        )
+    
+    result = await notifications_collection.update_many(
+        {"_id": {"$in": obj_ids}, "user_id": user_id},
+        {"$set": {"read": True}}
+    )
+    
+    return MarkReadResult(matched_count=result.matched_count, modified_count=result.modified_count)
+
+@router.get("/user/{user_id}/stream")
+async def stream_user_notifications(
+    user_id: str,
+    request: Request,
+    last_event_id: Optional[str] = Query(None),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    logger.info(f"Opening notification stream for user: {user_id}")
+    
+    resume_from = last_event_id_header or last_event_id
+    if resume_from and not valid_resume_token(resume_from):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid resume token"
+        )
+    
+    return StreamingResponse(
+        notification_events(request, user_id, resume_from),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.patch("/{notification_id}/read")
 async def mark_as_read(notification_id: str):
     logger.info(f"Marking notification as read: {notification_id}")
@@ -50,18 +149,18 @@ async def mark_as_read(notification_id: str):
             detail="Invalid notification ID format"
         )
     
-    result = await notifications_collection.update_one(
+    updated_notification = await notifications_collection.find_one_and_update(
         {"_id": obj_id},
-        {"$set": {"read": True}}
+        {"$set": {"read": True}},
+        return_document=ReturnDocument.AFTER
     )
     
-    if result.matched_count == 0:
+    if not updated_notification:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Notification not found"
         )
     
-    updated_notification = await notifications_collection.find_one({"_id": obj_id})
     updated_notification["_id"] = str(updated_notification["_id"])
     
     return NotificationResponse(**updated_notification)
\ No newline at end of file
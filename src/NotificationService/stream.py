@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import re
+from collections import defaultdict
+from typing import List, Optional
+from fastapi import Request
+from pymongo.errors import BulkWriteError, PyMongoError
+from models import NotificationResponse
+from database import notifications_collection
+from config import NOTIFICATION_FANOUT, STREAM_QUEUE_SIZE, STREAM_HEARTBEAT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+class NotificationBroker:
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        self._subscribers[user_id].discard(queue)
+        if not self._subscribers[user_id]:
+            del self._subscribers[user_id]
+
+    def publish(self, notification: dict):
+        for queue in self._subscribers.get(notification["user_id"], ()):
+            try:
+                queue.put_nowait(notification)
+            except asyncio.QueueFull:
+                logger.warning(f"Dropping live notification for slow subscriber of {notification['user_id']}")
+
+broker = NotificationBroker(STREAM_QUEUE_SIZE)
+_watcher: Optional[asyncio.Task] = None
+_write_lock = asyncio.Lock()
+_next_seq: Optional[int] = None
+
+DUPLICATE_KEY = 11000
+PUBLISHED = "_published"
+REPLAY_WAIT_MS = 200
+RESUME_TOKEN = re.compile("^[0-9A-Fa-f]+$")
+
+def valid_resume_token(token: str) -> bool:
+    if NOTIFICATION_FANOUT == "changestream":
+        return bool(RESUME_TOKEN.match(token))
+    return token.isdigit() and token.isascii()
+
+async def _insert(documents: List[dict]):
+    try:
+        await notifications_collection.insert_many(documents, ordered=False)
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        if any(error["code"] != DUPLICATE_KEY for error in errors) or e.details.get("writeConcernErrors"):
+            raise
+
+async def _reserve(count: int) -> int:
+    global _next_seq
+    if _next_seq is None:
+        latest = await notifications_collection.find_one({"seq": {"$exists": True}}, {"seq": 1}, sort=[("seq", -1)])
+        _next_seq = latest["seq"] + 1 if latest else 1
+    first = _next_seq
+    _next_seq += count
+    return first
+
+def _publish(documents: List[dict]):
+    for document in documents:
+        if not document.get(PUBLISHED):
+            document[PUBLISHED] = True
+            broker.publish(dict(document))
+
+async def append_notifications(documents: List[dict]):
+    if NOTIFICATION_FANOUT == "changestream":
+        # Each replica's broker is fed by the change stream, resume tokens give the order
+        await _insert(documents)
+        return
+
+    # The memory broker only works with a single replica, so serializing its
+    # writes makes seq follow commit order and readers never pass a lower one.
+    # A retried document gets a fresh seq so it still lands after the others.
+    async with _write_lock:
+        pending = documents
+        if any("seq" in document for document in documents):
+            written = {
+                document["_id"] async for document in notifications_collection.find(
+                    {"_id": {"$in": [document["_id"] for document in documents if "_id" in document]}}, {"_id": 1}
+                )
+            }
+            _publish([document for document in documents if document.get("_id") in written])
+            pending = [document for document in documents if document.get("_id") not in written]
+        if not pending:
+            return
+        first = await _reserve(len(pending))
+        for seq, document in enumerate(pending, first):
+            document["seq"] = seq
+        inserted = 0
+        try:
+            await notifications_collection.insert_many(pending)
+            inserted = len(pending)
+        except BulkWriteError as e:
+            inserted = e.details.get("nInserted", 0)
+            raise
+        finally:
+            _publish(pending[:inserted])
+
+async def _watch_change_stream():
+    pipeline = [{"$match": {"operationType": "insert"}}]
+    resume_token = None
+    while True:
+        try:
+            async with notifications_collection.watch(pipeline, resume_after=resume_token) as change_stream:
+                logger.info("Watching notifications change stream")
+                async for change in change_stream:
+                    resume_token = change["_id"]
+                    broker.publish({**change["fullDocument"], "resume_token": change["_id"]["_data"]})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Notifications change stream error: {str(e)}")
+            await asyncio.sleep(5)
+
+def start_fanout():
+    global _watcher
+    if NOTIFICATION_FANOUT == "changestream":
+        _watcher = asyncio.create_task(_watch_change_stream())
+
+async def stop_fanout():
+    global _watcher
+    if _watcher:
+        _watcher.cancel()
+        try:
+            await _watcher
+        except asyncio.CancelledError:
+            pass
+        _watcher = None
+
+def _event_id(notification: dict) -> str:
+    if NOTIFICATION_FANOUT == "changestream":
+        return notification["resume_token"]
+    return str(notification.get("seq", ""))
+
+def _format_event(notification: dict) -> str:
+    event_id = _event_id(notification)
+    notification = {**notification, "_id": str(notification["_id"])}
+    data = NotificationResponse(**notification).model_dump_json(by_alias=True)
+    return f"id: {event_id}\nevent: notification\ndata: {data}\n\n"
+
+async def _missed(user_id: str, resume_from: str):
+    if NOTIFICATION_FANOUT == "changestream":
+        pipeline = [{"$match": {"operationType": "insert", "fullDocument.user_id": user_id}}]
+        async with notifications_collection.watch(
+            pipeline,
+            resume_after={"_data": resume_from},
+            max_await_time_ms=REPLAY_WAIT_MS
+        ) as change_stream:
+            while True:
+                change = await change_stream.try_next()
+                if change is None:
+                    return
+                yield {**change["fullDocument"], "resume_token": change["_id"]["_data"]}
+    else:
+        missed = notifications_collection.find({"user_id": user_id, "seq": {"$gt": int(resume_from)}}).sort("seq", 1)
+        async for notification in missed:
+            yield notification
+
+async def notification_events(request: Request, user_id: str, resume_from: Optional[str]):
+    queue = broker.subscribe(user_id)
+    try:
+        yield "retry: 3000\n\n"
+        # Live notifications can arrive in any id order, so only the ones
+        # already sent by the replay are skipped.
+        replayed = set()
+        if resume_from:
+            try:
+                async for notification in _missed(user_id, resume_from):
+                    replayed.add(notification["_id"])
+                    yield _format_event(notification)
+            except PyMongoError as e:
+                logger.warning(f"Cannot resume notification stream for {user_id} from {resume_from}: {str(e)}")
+                yield "event: reset\ndata: {}\n\n"
+
+        while not await request.is_disconnected():
+            try:
+                notification = await asyncio.wait_for(queue.get(), timeout=STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if notification["_id"] in replayed:
+                replayed.discard(notification["_id"])
+                continue
+            yield _format_event(notification)
+    finally:
+        broker.unsubscribe(user_id, queue)
\ No newline at end of file
@@ -0,0 +1,109 @@
+import logging
+from typing import Dict
+import httpx
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from config import (
+    AUTH_SERVICE_URL,
+    ADMIN_SERVICE_URL,
+    TICKET_SERVICE_URL,
+    MEDIA_SERVICE_URL,
+    GEO_SERVICE_URL,
+    NOTIFICATION_SERVICE_URL,
+    AUTH_SERVICE_TIMEOUT,
+    ADMIN_SERVICE_TIMEOUT,
+    TICKET_SERVICE_TIMEOUT,
+    MEDIA_SERVICE_TIMEOUT,
+    GEO_SERVICE_TIMEOUT,
+    NOTIFICATION_SERVICE_TIMEOUT,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_CONNECT_TIMEOUT,
+    STREAM_MAX_CONNECTIONS,
+)
+
+logger = logging.getLogger(__name__)
+
+SERVICES = {
+    "auth": (AUTH_SERVICE_URL, AUTH_SERVICE_TIMEOUT),
+    "admin": (ADMIN_SERVICE_URL, ADMIN_SERVICE_TIMEOUT),
+    "ticket": (TICKET_SERVICE_URL, TICKET_SERVICE_TIMEOUT),
+    "media": (MEDIA_SERVICE_URL, MEDIA_SERVICE_TIMEOUT),
+    "geo": (GEO_SERVICE_URL, GEO_SERVICE_TIMEOUT),
+    "notification": (NOTIFICATION_SERVICE_URL, NOTIFICATION_SERVICE_TIMEOUT),
+}
+
+# Long-lived streams hold their connection for as long as the listener stays,
+# so they get a pool of their own instead of starving the request clients.
+STREAM_SERVICES = {
+    "notification-stream": (NOTIFICATION_SERVICE_URL, NOTIFICATION_SERVICE_TIMEOUT),
+}
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+async def start_clients():
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+    )
+    for name, (base_url, timeout) in SERVICES.items():
+        _clients[name] = httpx.AsyncClient(
+            base_url=base_url,
+            limits=limits,
+            timeout=httpx.Timeout(timeout, connect=HTTP_CONNECT_TIMEOUT)
+        )
+        logger.info(f"HTTP client for {name} service ready: {base_url} (timeout {timeout}s)")
+    
+    stream_limits = httpx.Limits(
+        max_connections=STREAM_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+    )
+    for name, (base_url, timeout) in STREAM_SERVICES.items():
+        _clients[name] = httpx.AsyncClient(
+            base_url=base_url,
+            limits=stream_limits,
+            timeout=httpx.Timeout(timeout, connect=HTTP_CONNECT_TIMEOUT, read=None, pool=HTTP_CONNECT_TIMEOUT)
+        )
+        logger.info(f"HTTP client for {name} ready: {base_url} (max {STREAM_MAX_CONNECTIONS} streams)")
+
+async def close_clients():
+    for name, client in _clients.items():
+        await client.aclose()
+        logger.info(f"HTTP client for {name} service closed")
+    _clients.clear()
+
+def get_client(name: str) -> httpx.AsyncClient:
+    client = _clients.get(name)
+    if client is None:
+        raise RuntimeError(f"HTTP client for {name} service is not started")
+    return client
+
+PASSTHROUGH_HEADERS = {
+    "content-type",
+    "content-disposition",
+    "content-length",
+    "content-range",
+    "content-encoding",
+    "accept-ranges",
+    "etag",
+    "last-modified",
+    "cache-control",
+    "x-accel-buffering",
+}
+
+async def stream_response(client: httpx.AsyncClient, method: str, url: str, **kwargs) -> StreamingResponse:
+    request = client.build_request(method, url, **kwargs)
+    response = await client.send(request, stream=True)
+    headers = {
+        name: value for name, value in response.headers.items()
+        if name.lower() in PASSTHROUGH_HEADERS
+    }
+    return StreamingResponse(
+        response.aiter_raw(),
+        status_code=response.status_code,
+        headers=headers,
+        background=BackgroundTask(response.aclose)
+    )
\ No newline at end of file
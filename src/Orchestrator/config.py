@@ -9,4 +9,30 @@ TICKET_SERVICE_URL = os.getenv("TICKET_SERVICE_URL", "http://localhost:8003")
 MEDIA_SERVICE_URL = os.getenv("MEDIA_SERVICE_URL", "http://localhost:8004")
 GEO_SERVICE_URL = os.getenv("GEO_SERVICE_URL", "http://localhost:8005")
 NOTIFICATION_SERVICE_URL = os.getenv("NOTIFICATION_SERVICE_URL", "http://localhost:8006")
-CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:5173").split(",")
\ No newline at end of file
+CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:5173").split(",")
+JWT_SECRET = os.getenv("JWT_SECRET", "your-secret-key-change-in-production")
+JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "30"))
+MEDIA_MAX_UPLOAD_SIZE = int(os.getenv("MEDIA_MAX_UPLOAD_SIZE", "10551296"))
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "2"))
+STREAM_MAX_CONNECTIONS = int(os.getenv("STREAM_MAX_CONNECTIONS", "1000"))
+
+AUTH_SERVICE_TIMEOUT = float(os.getenv("AUTH_SERVICE_TIMEOUT", "5"))
+ADMIN_SERVICE_TIMEOUT = float(os.getenv("ADMIN_SERVICE_TIMEOUT", "10"))
+TICKET_SERVICE_TIMEOUT = float(os.getenv("TICKET_SERVICE_TIMEOUT", "5"))
+MEDIA_SERVICE_TIMEOUT = float(os.getenv("MEDIA_SERVICE_TIMEOUT", "30"))
+GEO_SERVICE_TIMEOUT = float(os.getenv("GEO_SERVICE_TIMEOUT", "10"))
+NOTIFICATION_SERVICE_TIMEOUT = float(os.getenv("NOTIFICATION_SERVICE_TIMEOUT", "5"))
+
+RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+CACHE_TTL_MAP_TILES = float(os.getenv("CACHE_TTL_MAP_TILES", "86400"))
+CACHE_TTL_BOUNDARIES = float(os.getenv("CACHE_TTL_BOUNDARIES", "3600"))
+CACHE_TTL_MUNICIPALITIES = float(os.getenv("CACHE_TTL_MUNICIPALITIES", "3600"))
\ No newline at end of file
@@ -4,7 +4,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from config import CORS_ORIGINS
-from middleware import LoggingMiddleware
+from middleware import LoggingMiddleware, AuthMiddleware
+from clients import start_clients, close_clients
+from response_cache import start_response_cache, close_response_cache
 from routers import auth, admin, tickets, media, geo, notifications
 
 load_dotenv()
@@ -28,8 +30,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Duplicate-Of"],
 )
 
+app.add_middleware(AuthMiddleware)
 app.add_middleware(LoggingMiddleware)
 
 app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
@@ -55,10 +59,14 @@ async def health_check():
 async def startup_event():
     logger.info("Orchestrator starting up...")
     logger.info(f"CORS Origins: {CORS_ORIGINS}")
+    await start_clients()
+    await start_response_cache()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Orchestrator shutting down...")
+    await close_clients()
+    await close_response_cache()
 
 if __name__ == "__main__":
     import uvicorn
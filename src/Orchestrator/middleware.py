@@ -2,6 +2,7 @@ import logging
 import time
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
+from tokens import decode_token
 
 logger = logging.getLogger(__name__)
 
@@ -16,4 +17,20 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         process_time = time.time() - start_time
         logger.info(f"Response: {response.status_code} - {process_time:.3f}s")
         
-        return response
\ No newline at end of file
+        return response
+
+class AuthMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request.state.user = None
+        request.state.auth_error = "Invalid authorization header"
+        
+        authorization = request.headers.get("Authorization", "")
+        if authorization.startswith("Bearer "):
+            claims = decode_token(authorization.split(" ", 1)[1])
+            if claims:
+                request.state.user = claims
+                request.state.auth_error = None
+            else:
+                request.state.auth_error = "Invalid or expired token"
+        
+        return await call_next(request)
\ No newline at end of file
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+import httpx
+from fastapi import Request, Response, status
+from fastapi.responses import JSONResponse
+from common.ttl_cache import TTLCache
+from config import RESPONSE_CACHE_BACKEND, RESPONSE_CACHE_SIZE, REDIS_URL
+
+logger = logging.getLogger(__name__)
+
+class MemoryBackend:
+    def __init__(self, max_size: int):
+        self._cache = TTLCache(max_size, 0)
+
+    async def get(self, key: str) -> Optional[dict]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, entry: dict, ttl: float):
+        self._cache.set(key, entry, expires_at=time.time() + ttl)
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self._cache.delete(key)
+
+    async def close(self):
+        self._cache.clear()
+
+class RedisBackend:
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+        self._redis = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[dict]:
+        value = await self._redis.get(f"response-cache:{key}")
+        return json.loads(value) if value else None
+
+    async def set(self, key: str, entry: dict, ttl: float):
+        await self._redis.set(f"response-cache:{key}", json.dumps(entry), ex=max(int(ttl), 1))
+
+    async def delete(self, *keys: str):
+        await self._redis.delete(*[f"response-cache:{key}" for key in keys])
+
+    async def close(self):
+        await self._redis.aclose()
+
+_backend = None
+
+async def start_response_cache():
+    global _backend
+    if RESPONSE_CACHE_BACKEND == "redis":
+        _backend = RedisBackend(REDIS_URL)
+    else:
+        _backend = MemoryBackend(RESPONSE_CACHE_SIZE)
+    logger.info(f"Response cache backend: {type(_backend).__name__}")
+
+async def close_response_cache():
+    global _backend
+    if _backend:
+        await _backend.close()
+        _backend = None
+
+def _etag_matches(header: str, etag: str) -> bool:
+    candidates = [value.strip() for value in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+def _cached_response(request: Request, entry: dict) -> Response:
+    headers = {"ETag": entry["etag"], "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, entry["etag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+async def cached_json(
+    request: Request,
+    key: str,
+    ttl: float,
+    fetch: Callable[[], Awaitable[httpx.Response]]
+) -> Response:
+    entry = await _backend.get(key)
+    if entry is None:
+        response = await fetch()
+        if response.status_code != status.HTTP_200_OK:
+            return JSONResponse(content=response.json(), status_code=response.status_code)
+        body = response.text
+        entry = {
+            "body": body,
+            "etag": f'"{hashlib.sha256(body.encode()).hexdigest()[:32]}"'
+        }
+        await _backend.set(key, entry, ttl)
+    return _cached_response(request, entry)
+
+async def invalidate(*keys: str):
+    await _backend.delete(*keys)
+    logger.info(f"Invalidated cached responses: {', '.join(keys)}")
\ No newline at end of file
@@ -1,30 +1,68 @@
-from fastapi import APIRouter, Request
+import logging
 import httpx
-from config import ADMIN_SERVICE_URL
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse
+from typing import Optional
+from clients import get_client, stream_response
+from config import CACHE_TTL_MUNICIPALITIES
+from response_cache import cached_json, invalidate
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+async def _reload_boundaries():
+    # GeoService also polls for boundary changes, so a failed nudge only delays the reload.
+    try:
+        await get_client("geo").post("/geo/boundaries/reload")
+    except httpx.HTTPError as e:
+        logger.warning(f"Failed to reload GeoService boundaries: {str(e)}")
 
 @router.get("/municipalities")
-async def get_municipalities():
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{ADMIN_SERVICE_URL}/admin/municipalities")
-        return response.json()
+async def get_municipalities(request: Request):
+    client = get_client("admin")
+    return await cached_json(
+        request,
+        "admin:municipalities",
+        CACHE_TTL_MUNICIPALITIES,
+        lambda: client.get("/admin/municipalities")
+    )
 
 @router.post("/municipalities")
 async def create_municipality(request: Request):
-    async with httpx.AsyncClient() as client:
-        body = await request.json()
-        response = await client.post(f"{ADMIN_SERVICE_URL}/admin/municipalities", json=body)
-        return response.json()
+    client = get_client("admin")
+    body = await request.json()
+    response = await client.post("/admin/municipalities", json=body)
+    if response.status_code == status.HTTP_201_CREATED:
+        await invalidate("admin:municipalities", "geo:boundaries")
+        if body.get("boundary"):
+            await _reload_boundaries()
+    return response.json()
+
+@router.put("/municipalities/{municipality_id}/boundary")
+async def set_municipality_boundary(municipality_id: str, request: Request):
+    client = get_client("admin")
+    body = await request.json()
+    response = await client.put(f"/admin/municipalities/{municipality_id}/boundary", json=body)
+    if response.status_code == status.HTTP_200_OK:
+        await invalidate("admin:municipalities", "geo:boundaries")
+        await _reload_boundaries()
+    return JSONResponse(content=response.json(), status_code=response.status_code)
 
 @router.get("/stats")
-async def get_stats():
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{ADMIN_SERVICE_URL}/admin/stats")
-        return response.json()
+async def get_stats(max_staleness: Optional[int] = None):
+    client = get_client("admin")
+    params = {}
+    if max_staleness is not None:
+        params["max_staleness"] = max_staleness
+    response = await client.get("/admin/stats", params=params)
+    return response.json()
 
 @router.get("/tickets/all")
-async def get_all_tickets():
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{ADMIN_SERVICE_URL}/admin/tickets/all")
-        return response.json()
\ No newline at end of file
+async def get_all_tickets(request: Request):
+    client = get_client("admin")
+    return await stream_response(
+        client,
+        "GET",
+        "/admin/tickets/all",
+        params=request.query_params
+    )
\ No newline at end of file
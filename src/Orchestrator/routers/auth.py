@@ -1,32 +1,49 @@
-from fastapi import APIRouter, Request
-import httpx
-from config import AUTH_SERVICE_URL
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse
+from clients import get_client
+from tokens import profile_cache
 
 router = APIRouter()
 
 @router.post("/register")
 async def register(request: Request):
-    async with httpx.AsyncClient() as client:
-        body = await request.json()
-        response = await client.post(f"{AUTH_SERVICE_URL}/auth/register", json=body)
-        return response.json()
+    client = get_client("auth")
+    body = await request.json()
+    response = await client.post("/auth/register", json=body)
+    return response.json()
 
 @router.post("/login")
 async def login(request: Request):
-    async with httpx.AsyncClient() as client:
-        body = await request.json()
-        response = await client.post(f"{AUTH_SERVICE_URL}/auth/login", json=body)
-        return response.json()
+    client = get_client("auth")
+    body = await request.json()
+    response = await client.post("/auth/login", json=body)
+    return response.json()
 
 @router.get("/me")
 async def get_me(request: Request):
-    async with httpx.AsyncClient() as client:
-        headers = {"Authorization": request.headers.get("Authorization", "")}
-        response = await client.get(f"{AUTH_SERVICE_URL}/auth/me", headers=headers)
-        return response.json()
+    claims = request.state.user
+    if not claims:
+        return JSONResponse(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            content={"detail": request.state.auth_error}
+        )
+    
+    profile = profile_cache.get(claims["sub"])
+    if profile is not None:
+        return profile
+    
+    client = get_client("auth")
+    headers = {"Authorization": request.headers.get("Authorization", "")}
+    response = await client.get("/auth/me", headers=headers)
+    if response.status_code != status.HTTP_200_OK:
+        return JSONResponse(content=response.json(), status_code=response.status_code)
+    
+    profile = response.json()
+    profile_cache.set(claims["sub"], profile)
+    return profile
 
 @router.post("/logout")
 async def logout():
-    async with httpx.AsyncClient() as client:
-        response = await client.post(f"{AUTH_SERVICE_URL}/auth/logout")
-        return response.json()
\ No newline at end of file
+    client = get_client("auth")
+    response = await client.post("/auth/logout")
+    return response.json()
\ No newline at end of file
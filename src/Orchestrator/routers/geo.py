@@ -1,31 +1,55 @@
 from fastapi import APIRouter, Request
-import httpx
-from config import GEO_SERVICE_URL
+from fastapi.responses import JSONResponse
+from clients import get_client
+from config import CACHE_TTL_MAP_TILES, CACHE_TTL_BOUNDARIES
+from response_cache import cached_json
 
 router = APIRouter()
 
 @router.post("/geocode")
 async def geocode_address(request: Request):
-    async with httpx.AsyncClient() as client:
-        body = await request.json()
-        response = await client.post(f"{GEO_SERVICE_URL}/geo/geocode", json=body)
-        return response.json()
+    client = get_client("geo")
+    body = await request.json()
+    response = await client.post("/geo/geocode", json=body)
+    return response.json()
 
 @router.post("/reverse-geocode")
 async def reverse_geocode(request: Request):
-    async with httpx.AsyncClient() as client:
-        body = await request.json()
-        response = await client.post(f"{GEO_SERVICE_URL}/geo/reverse-geocode", json=body)
-        return response.json()
+    client = get_client("geo")
+    body = await request.json()
+    response = await client.post("/geo/reverse-geocode", json=body)
+    return response.json()
+
+@router.post("/locate")
+async def locate_point(request: Request):
+    client = get_client("geo")
+    body = await request.json()
+    response = await client.post("/geo/locate", json=body)
+    return JSONResponse(content=response.json(), status_code=response.status_code)
+
+@router.post("/locate/batch")
+async def locate_points(request: Request):
+    client = get_client("geo")
+    body = await request.json()
+    response = await client.post("/geo/locate/batch", json=body)
+    return JSONResponse(content=response.json(), status_code=response.status_code)
 
 @router.get("/map/tiles")
-async def get_map_tiles():
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{GEO_SERVICE_URL}/geo/map/tiles")
-        return response.json()
+async def get_map_tiles(request: Request):
+    client = get_client("geo")
+    return await cached_json(
+        request,
+        "geo:map-tiles",
+        CACHE_TTL_MAP_TILES,
+        lambda: client.get("/geo/map/tiles")
+    )
 
 @router.get("/boundaries")
-async def get_boundaries():
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{GEO_SERVICE_URL}/geo/boundaries")
-        return response.json()
\ No newline at end of file
+async def get_boundaries(request: Request):
+    client = get_client("geo")
+    return await cached_json(
+        request,
+        "geo:boundaries",
+        CACHE_TTL_BOUNDARIES,
+        lambda: client.get("/geo/boundaries")
+    )
\ No newline at end of file
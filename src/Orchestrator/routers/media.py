@@ -1,37 +1,73 @@
-from fastapi import APIRouter, UploadFile, File, Query
+from fastapi import APIRouter, Request, Query, status
+from fastapi.responses import JSONResponse
 from typing import Optional
-import httpx
-from config import MEDIA_SERVICE_URL
+from clients import get_client, stream_response
+from config import MEDIA_MAX_UPLOAD_SIZE
 
 router = APIRouter()
 
+CONDITIONAL_HEADERS = {"range", "if-range", "if-none-match", "if-modified-since"}
+
+class UploadTooLarge(Exception):
+    pass
+
+def too_large_response() -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        content={"detail": f"File too large. Max upload size: {MEDIA_MAX_UPLOAD_SIZE} bytes"}
+    )
+
+async def limited_stream(request: Request):
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > MEDIA_MAX_UPLOAD_SIZE:
+            raise UploadTooLarge()
+        yield chunk
+
 @router.post("/upload")
 async def upload_file(
-    file: UploadFile = File(...),
+    request: Request,
     user_id: str = Query(...),
     ticket_id: Optional[str] = Query(None)
 ):
-    async with httpx.AsyncClient() as client:
-        files = {"file": (file.filename, await file.read(), file.content_type)}
-        params = {"user_id": user_id}
-        if ticket_id:
-            params["ticket_id"] = ticket_id
-        
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MEDIA_MAX_UPLOAD_SIZE:
+        return too_large_response()
+    
+    client = get_client("media")
+    params = {"user_id": user_id}
+    if ticket_id:
+        params["ticket_id"] = ticket_id
+    
+    try:
         response = await client.post(
-            f"{MEDIA_SERVICE_URL}/media/upload",
-            files=files,
+            "/media/upload",
+            content=limited_stream(request),
+            headers={"Content-Type": request.headers.get("content-type", "")},
             params=params
         )
-        return response.json()
+    except UploadTooLarge:
+        return too_large_response()
+    return JSONResponse(content=response.json(), status_code=response.status_code)
 
 @router.get("/{file_id}")
-async def get_file(file_id: str):
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{MEDIA_SERVICE_URL}/media/{file_id}")
-        return response.content
+async def get_file(file_id: str, request: Request):
+    client = get_client("media")
+    headers = {
+        name: value for name, value in request.headers.items()
+        if name.lower() in CONDITIONAL_HEADERS
+    }
+    return await stream_response(
+        client,
+        "GET",
+        f"/media/{file_id}",
+        params=request.query_params,
+        headers=headers
+    )
 
 @router.delete("/{file_id}")
 async def delete_file(file_id: str):
-    async with httpx.AsyncClient() as client:
-        response = await client.delete(f"{MEDIA_SERVICE_URL}/media/{file_id}")
-        return response.json()
\ No newline at end of file
+    client = get_client("media")
+    response = await client.delete(f"/media/{file_id}")
+    return response.json()
\ No newline at end of file
@@ -1,27 +1,98 @@
-from fastapi import APIRouter, Request, Query
+from fastapi import APIRouter, Request, Query, status
+from fastapi.responses import JSONResponse
 import httpx
-from config import NOTIFICATION_SERVICE_URL
+from clients import get_client, stream_response
 
 router = APIRouter()
 
 @router.post("/send")
 async def send_notification(request: Request):
-    async with httpx.AsyncClient() as client:
-        body = await request.json()
-        response = await client.post(f"{NOTIFICATION_SERVICE_URL}/notify/send", json=body)
-        return response.json()
+    client = get_client("notification")
+    body = await request.json()
+    response = await client.post("/notify/send", json=body)
+    return response.json()
+
+@router.post("/send-batch")
+async def send_notification_batch(request: Request):
+    client = get_client("notification")
+    body = await request.json()
+    response = await client.post("/notify/send-batch", json=body)
+    return response.json()
+
+async def _enqueue(path: str, request: Request):
+    client = get_client("notification")
+    body = await request.json()
+    response = await client.post(path, json=body)
+    headers = {}
+    if "retry-after" in response.headers:
+        headers["Retry-After"] = response.headers["retry-after"]
+    return JSONResponse(content=response.json(), status_code=response.status_code, headers=headers)
+
+@router.post("/enqueue")
+async def enqueue_notification(request: Request):
+    return await _enqueue("/notify/enqueue", request)
+
+@router.post("/enqueue-batch")
+async def enqueue_notification_batch(request: Request):
+    return await _enqueue("/notify/enqueue-batch", request)
+
+@router.get("/outbox/metrics")
+async def get_outbox_metrics():
+    client = get_client("notification")
+    response = await client.get("/notify/outbox/metrics")
+    return response.json()
 
 @router.get("/user/{user_id}")
 async def get_user_notifications(user_id: str, unread_only: bool = Query(False)):
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{NOTIFICATION_SERVICE_URL}/notify/user/{user_id}",
-            params={"unread_only": unread_only}
+    client = get_client("notification")
+    response = await client.get(
+        f"/notify/user/{user_id}",
+        params={"unread_only": unread_only}
+    )
+    return response.json()
+
+@router.get("/user/{user_id}/unread-count")
+async def get_unread_count(user_id: str):
+    client = get_client("notification")
+    response = await client.get(f"/notify/user/{user_id}/unread-count")
+    return response.json()
+
+@router.patch("/user/{user_id}/read-all")
+async def mark_all_as_read(user_id: str):
+    client = get_client("notification")
+    response = await client.patch(f"/notify/user/{user_id}/read-all")
+    return response.json()
+
+@router.patch("/user/{user_id}/read")
+async def mark_many_as_read(user_id: str, request: Request):
+    client = get_client("notification")
+    body = await request.json()
+    response = await client.patch(f"/notify/user/{user_id}/read", json=body)
+    return response.json()
+
+@router.get("/user/{user_id}/stream")
+async def stream_user_notifications(user_id: str, request: Request):
+    client = get_client("notification-stream")
+    headers = {}
+    if "last-event-id" in request.headers:
+        headers["Last-Event-ID"] = request.headers["last-event-id"]
+    try:
+        return await stream_response(
+            client,
+            "GET",
+            f"/notify/user/{user_id}/stream",
+            params=request.query_params,
+            headers=headers
+        )
+    except httpx.PoolTimeout:
+        return JSONResponse(
+            content={"detail": "Too many open notification streams, please retry"},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={"Retry-After": "5"}
         )
-        return response.json()
 
 @router.patch("/{notification_id}/read")
 async def mark_as_read(notification_id: str):
-    async with httpx.AsyncClient() as client:
-        response = await client.patch(f"{NOTIFICATION_SERVICE_URL}/notify/{notification_id}/read")
-        return response.json()
\ No newline at end of file
+    client = get_client("notification")
+    response = await client.patch(f"/notify/{notification_id}/read")
+    return response.json()
\ No newline at end of file
@@ -1,62 +1,148 @@
 from fastapi import APIRouter, Request, Query
+from fastapi.responses import JSONResponse
 from typing import Optional
-import httpx
-from config import TICKET_SERVICE_URL
+from clients import get_client
 
 router = APIRouter()
 
 @router.post("/create")
 async def create_ticket(request: Request, user_id: str = Query(...)):
-    async with httpx.AsyncClient() as client:
-        body = await request.json()
-        response = await client.post(
-            f"{TICKET_SERVICE_URL}/tickets/create",
-            json=body,
-            params={"user_id": user_id}
-        )
-        return response.json()
+    client = get_client("ticket")
+    body = await request.json()
+    response = await client.post(
+        "/tickets/create",
+        json=body,
+        params={"user_id": user_id}
+    )
+    headers = {}
+    if "X-Duplicate-Of" in response.headers:
+        headers["X-Duplicate-Of"] = response.headers["X-Duplicate-Of"]
+    return JSONResponse(
+        content=response.json(),
+        status_code=response.status_code,
+        headers=headers
+    )
 
 @router.get("/list")
 async def get_tickets(
     tenant_id: Optional[str] = None,
     user_id: Optional[str] = None,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    needs_review: Optional[bool] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    bbox: Optional[str] = None,
+    near: Optional[str] = None,
+    radius_m: Optional[float] = None
 ):
-    async with httpx.AsyncClient() as client:
-        params = {}
-        if tenant_id:
-            params["tenant_id"] = tenant_id
-        if user_id:
-            params["user_id"] = user_id
-        if status:
-            params["status"] = status
-        
-        response = await client.get(f"{TICKET_SERVICE_URL}/tickets/list", params=params)
-        return response.json()
+    client = get_client("ticket")
+    params = {}
+    if tenant_id:
+        params["tenant_id"] = tenant_id
+    if user_id:
+        params["user_id"] = user_id
+    if status:
+        params["status"] = status
+    if needs_review:
+        params["needs_review"] = "true"
+    if limit:
+        params["limit"] = limit
+    if cursor:
+        params["cursor"] = cursor
+    if fields:
+        params["fields"] = fields
+    if bbox:
+        params["bbox"] = bbox
+    if near:
+        params["near"] = near
+    if radius_m:
+        params["radius_m"] = radius_m
+    
+    response = await client.get("/tickets/list", params=params)
+    headers = {}
+    if "X-Next-Cursor" in response.headers:
+        headers["X-Next-Cursor"] = response.headers["X-Next-Cursor"]
+    return JSONResponse(
+        content=response.json(),
+        status_code=response.status_code,
+        headers=headers
+    )
+
+@router.get("/search")
+async def search_tickets(request: Request):
+    client = get_client("ticket")
+    response = await client.get("/tickets/search", params=request.query_params)
+    return JSONResponse(content=response.json(), status_code=response.status_code)
+
+@router.get("/clusters")
+async def get_ticket_clusters(request: Request):
+    client = get_client("ticket")
+    response = await client.get("/tickets/clusters", params=request.query_params)
+    return JSONResponse(content=response.json(), status_code=response.status_code)
+
+@router.get("/changes")
+async def get_ticket_changes(request: Request):
+    client = get_client("ticket")
+    response = await client.get("/tickets/changes", params=request.query_params)
+    return JSONResponse(content=response.json(), status_code=response.status_code)
 
 @router.get("/{ticket_id}")
 async def get_ticket(ticket_id: str):
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{TICKET_SERVICE_URL}/tickets/{ticket_id}")
-        return response.json()
+    client = get_client("ticket")
+    response = await client.get(f"/tickets/{ticket_id}")
+    return response.json()
+
+@router.patch("/bulk")
+async def bulk_update_tickets(request: Request):
+    client = get_client("ticket")
+    body = await request.json()
+    response = await client.patch("/tickets/bulk", json=body)
+    return JSONResponse(content=response.json(), status_code=response.status_code)
 
 @router.patch("/{ticket_id}")
 async def update_ticket(ticket_id: str, request: Request):
-    async with httpx.AsyncClient() as client:
-        body = await request.json()
-        response = await client.patch(f"{TICKET_SERVICE_URL}/tickets/{ticket_id}", json=body)
-        return response.json()
+    client = get_client("ticket")
+    body = await request.json()
+    response = await client.patch(f"/tickets/{ticket_id}", json=body)
+    return response.json()
+
+@router.post("/{ticket_id}/review")
+async def review_duplicate(ticket_id: str, request: Request):
+    client = get_client("ticket")
+    body = await request.json()
+    response = await client.post(f"/tickets/{ticket_id}/review", json=body)
+    return JSONResponse(content=response.json(), status_code=response.status_code)
 
 @router.post("/{ticket_id}/comments")
 async def add_comment(ticket_id: str, request: Request):
-    async with httpx.AsyncClient() as client:
-        body = await request.json()
-        response = await client.post(f"{TICKET_SERVICE_URL}/tickets/{ticket_id}/comments", json=body)
-        return response.json()
+    client = get_client("ticket")
+    body = await request.json()
+    response = await client.post(f"/tickets/{ticket_id}/comments", json=body)
+    return response.json()
+
+@router.get("/{ticket_id}/comments")
+async def get_comments(ticket_id: str, limit: Optional[int] = None, cursor: Optional[str] = None):
+    client = get_client("ticket")
+    params = {}
+    if limit:
+        params["limit"] = limit
+    if cursor:
+        params["cursor"] = cursor
+    
+    response = await client.get(f"/tickets/{ticket_id}/comments", params=params)
+    headers = {}
+    if "X-Next-Cursor" in response.headers:
+        headers["X-Next-Cursor"] = response.headers["X-Next-Cursor"]
+    return JSONResponse(
+        content=response.json(),
+        status_code=response.status_code,
+        headers=headers
+    )
 
 @router.post("/{ticket_id}/feedback")
 async def add_feedback(ticket_id: str, request: Request):
-    async with httpx.AsyncClient() as client:
-        body = await request.json()
-        response = await client.post(f"{TICKET_SERVICE_URL}/tickets/{ticket_id}/feedback", json=body)
-        return response.json()
\ No newline at end of file
+    client = get_client("ticket")
+    body = await request.json()
+    response = await client.post(f"/tickets/{ticket_id}/feedback", json=body)
+    return response.json()
\ No newline at end of file
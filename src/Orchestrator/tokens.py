@@ -0,0 +1,25 @@
+import time
+from typing import Optional
+from jose import JWTError, jwt
+from common.ttl_cache import TTLCache
+from config import JWT_SECRET, JWT_ALGORITHM, TOKEN_CACHE_SIZE, USER_CACHE_SIZE, USER_CACHE_TTL
+
+token_cache = TTLCache(TOKEN_CACHE_SIZE, 0)
+profile_cache = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+
+def decode_token(token: str) -> Optional[dict]:
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
+    
+    try:
+        claims = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+    except JWTError:
+        return None
+    if not claims.get("sub"):
+        return None
+    
+    expires_at = claims.get("exp")
+    if expires_at and expires_at > time.time():
+        token_cache.set(token, claims, expires_at=expires_at)
+    return claims
\ No newline at end of file
@@ -0,0 +1,109 @@
+import hashlib
+import logging
+from typing import Optional
+from bson import ObjectId
+from pymongo import DESCENDING, ReturnDocument
+from pymongo.errors import BulkWriteError
+from database import tickets_collection, comments_collection
+from config import TICKET_RECENT_COMMENTS
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_BATCH_SIZE = 500
+
+LEGACY_COMMENT = {"$elemMatch": {"id": {"$exists": False}}}
+MIGRATED = {"comment_count": {"$exists": True}, "comments": {"$not": LEGACY_COMMENT}}
+UNMIGRATED = {"$or": [{"comment_count": {"$exists": False}}, {"comments": LEGACY_COMMENT}]}
+DUPLICATE_KEY = 11000
+
+def recent_comments_update(comment: dict) -> dict:
+    return {
+        "$push": {"comments": {"$each": [comment], "$slice": -TICKET_RECENT_COMMENTS}},
+        "$inc": {"comment_count": 1}
+    }
+
+def embedded_comment(comment: dict) -> dict:
+    return {
+        "id": str(comment["_id"]),
+        "user_id": comment["user_id"],
+        "message": comment["message"],
+        "created_at": comment["created_at"]
+    }
+
+def legacy_comment_id(ticket_id: ObjectId, position: int) -> ObjectId:
+    return ObjectId(hashlib.sha256(f"{ticket_id}:{position}".encode()).digest()[:12])
+
+async def attach_comment(comment: dict) -> Optional[dict]:
+    # Migrated tickets keep a capped window plus a counter. Unmigrated ones only
+    # get the comment appended, the migration recounts from comments_collection.
+    # A ticket only ever moves from unmigrated to migrated, so three tries cover it.
+    updates = [
+        (MIGRATED, recent_comments_update(embedded_comment(comment))),
+        (UNMIGRATED, {"$push": {"comments": embedded_comment(comment)}}),
+        (MIGRATED, recent_comments_update(embedded_comment(comment)))
+    ]
+    for state, update in updates:
+        update["$set"] = {"updated_at": comment["created_at"]}
+        ticket = await tickets_collection.find_one_and_update(
+            {"_id": comment["ticket_id"], **state},
+            update,
+            return_document=ReturnDocument.AFTER
+        )
+        if ticket:
+            return ticket
+    return None
+
+async def _insert_missing(comments: list):
+    try:
+        await comments_collection.insert_many(comments, ordered=False)
+    except BulkWriteError as e:
+        if any(error["code"] != DUPLICATE_KEY for error in e.details["writeErrors"]):
+            raise
+
+async def _migrate_ticket(ticket_id: ObjectId) -> int:
+    while True:
+        ticket = await tickets_collection.find_one({"_id": ticket_id, **UNMIGRATED}, {"comments": 1})
+        if not ticket:
+            return 0
+        embedded = ticket.get("comments")
+        legacy = [
+            {
+                "_id": legacy_comment_id(ticket_id, position),
+                "ticket_id": ticket_id,
+                "user_id": comment.get("user_id"),
+                "message": comment.get("message"),
+                "created_at": comment.get("created_at")
+            }
+            for position, comment in enumerate(embedded or [])
+            if "id" not in comment
+        ]
+        if legacy:
+            await _insert_missing(legacy)
+
+        count = await comments_collection.count_documents({"ticket_id": ticket_id})
+        recent = await comments_collection.find({"ticket_id": ticket_id}).sort(
+            [("created_at", DESCENDING), ("_id", DESCENDING)]
+        ).limit(TICKET_RECENT_COMMENTS).to_list(length=TICKET_RECENT_COMMENTS)
+
+        # Only applies if no comment was appended since the read, otherwise recount.
+        result = await tickets_collection.update_one(
+            {"_id": ticket_id, **UNMIGRATED, "comments": embedded},
+            {"$set": {
+                "comment_count": count,
+                "comments": [embedded_comment(comment) for comment in reversed(recent)]
+            }}
+        )
+        if result.modified_count:
+            return len(legacy)
+
+async def migrate_comments():
+    tickets = moved = 0
+    while True:
+        batch = await tickets_collection.find(UNMIGRATED, {"_id": 1}).limit(MIGRATION_BATCH_SIZE).to_list(length=MIGRATION_BATCH_SIZE)
+        if not batch:
+            break
+        for ticket in batch:
+            moved += await _migrate_ticket(ticket["_id"])
+        tickets += len(batch)
+        logger.info(f"Migrated {tickets} tickets, moved {moved} comments")
+    logger.info(f"Comment migration finished: {tickets} tickets, {moved} comments")
\ No newline at end of file
@@ -0,0 +1,28 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+TICKETS_PAGE_SIZE = int(os.getenv("TICKETS_PAGE_SIZE", "50"))
+TICKETS_MAX_PAGE_SIZE = int(os.getenv("TICKETS_MAX_PAGE_SIZE", "200"))
+TICKETS_MAX_RADIUS_M = float(os.getenv("TICKETS_MAX_RADIUS_M", "50000"))
+TICKETS_MAX_CLUSTER_CELLS = int(os.getenv("TICKETS_MAX_CLUSTER_CELLS", "1024"))
+TICKET_RECENT_COMMENTS = int(os.getenv("TICKET_RECENT_COMMENTS", "5"))
+COMMENTS_PAGE_SIZE = int(os.getenv("COMMENTS_PAGE_SIZE", "50"))
+COMMENTS_MAX_PAGE_SIZE = int(os.getenv("COMMENTS_MAX_PAGE_SIZE", "200"))
+TICKETS_SEARCH_LANGUAGE = os.getenv("TICKETS_SEARCH_LANGUAGE", "italian")
+TICKETS_SEARCH_PAGE_SIZE = int(os.getenv("TICKETS_SEARCH_PAGE_SIZE", "20"))
+TICKETS_SEARCH_MAX_OFFSET = int(os.getenv("TICKETS_SEARCH_MAX_OFFSET", "1000"))
+DUPLICATE_ACTION = os.getenv("DUPLICATE_ACTION", "flag")
+DUPLICATE_RADIUS_M = float(os.getenv("DUPLICATE_RADIUS_M", "50"))
+DUPLICATE_WINDOW_DAYS = float(os.getenv("DUPLICATE_WINDOW_DAYS", "14"))
+DUPLICATE_CHECK_TIMEOUT_MS = int(os.getenv("DUPLICATE_CHECK_TIMEOUT_MS", "50"))
+TICKETS_BULK_MAX = int(os.getenv("TICKETS_BULK_MAX", "1000"))
+NOTIFICATION_SERVICE_URL = os.getenv("NOTIFICATION_SERVICE_URL", "http://localhost:8006")
+NOTIFICATION_SERVICE_TIMEOUT = float(os.getenv("NOTIFICATION_SERVICE_TIMEOUT", "5"))
+TICKET_EVENTS_SOURCE = os.getenv("TICKET_EVENTS_SOURCE", "log")
+TICKET_EVENTS_PAGE_SIZE = int(os.getenv("TICKET_EVENTS_PAGE_SIZE", "100"))
+TICKET_EVENTS_MAX_PAGE_SIZE = int(os.getenv("TICKET_EVENTS_MAX_PAGE_SIZE", "1000"))
+TICKET_EVENTS_GAP_TIMEOUT_SECONDS = float(os.getenv("TICKET_EVENTS_GAP_TIMEOUT_SECONDS", "30"))
+TICKET_EVENTS_APPEND_ATTEMPTS = int(os.getenv("TICKET_EVENTS_APPEND_ATTEMPTS", "3"))
+TICKET_CHANGE_STREAM_WAIT_MS = int(os.getenv("TICKET_CHANGE_STREAM_WAIT_MS", "1000"))
\ No newline at end of file
@@ -11,6 +11,10 @@ db = client.cityfix
 
 tickets_collection = db.tickets
 operators_collection = db.operators
+stats_collection = db.stats
+comments_collection = db.ticket_comments
+ticket_events_collection = db.ticket_events
+counters_collection = db.counters
 
 async def get_database():
     return db
\ No newline at end of file
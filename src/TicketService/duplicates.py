@@ -0,0 +1,61 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from pymongo import ReturnDocument
+from pymongo.errors import ExecutionTimeout, PyMongoError
+from database import tickets_collection
+from config import DUPLICATE_RADIUS_M, DUPLICATE_WINDOW_DAYS, DUPLICATE_CHECK_TIMEOUT_MS
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = ["pending", "in_progress"]
+KEPT_DUPLICATE_REPORTS = 20
+
+def duplicate_query(ticket: dict) -> dict:
+    return {
+        "tenant_id": ticket["tenant_id"],
+        "category": ticket["category"],
+        "status": {"$in": OPEN_STATUSES},
+        "point": {"$nearSphere": {"$geometry": ticket["point"], "$maxDistance": DUPLICATE_RADIUS_M}},
+        "created_at": {"$gte": ticket["created_at"] - timedelta(days=DUPLICATE_WINDOW_DAYS)}
+    }
+
+def reporter_filter(user_id: str) -> dict:
+    # Reporters of attached duplicates are kept on the original ticket
+    return {"$and": [{"$or": [{"reported_by": user_id}, {"reporters": user_id}]}]}
+
+async def find_duplicate(ticket: dict) -> Optional[dict]:
+    if "point" not in ticket:
+        return None
+    try:
+        return await tickets_collection.find_one(
+            duplicate_query(ticket),
+            {"_id": 1},
+            max_time_ms=DUPLICATE_CHECK_TIMEOUT_MS
+        )
+    except ExecutionTimeout:
+        logger.warning(f"Duplicate check timed out for ticket: {ticket['title']}")
+    except PyMongoError as e:
+        logger.error(f"Duplicate check failed: {str(e)}")
+    return None
+
+async def attach_duplicate(ticket_id, ticket: dict) -> Optional[dict]:
+    report = {
+        "reported_by": ticket["reported_by"],
+        "title": ticket["title"],
+        "description": ticket["description"],
+        "location": ticket["location"],
+        "images": ticket.get("images") or [],
+        "created_at": ticket["created_at"]
+    }
+    return await tickets_collection.find_one_and_update(
+        {"_id": ticket_id},
+        {
+            "$push": {"duplicate_reports": {"$each": [report], "$slice": -KEPT_DUPLICATE_REPORTS}},
+            "$inc": {"duplicate_count": 1},
+            "$addToSet": {"reporters": ticket["reported_by"]},
+            "$set": {"updated_at": datetime.utcnow()}
+        },
+        projection={"duplicate_reports": 0},
+        return_document=ReturnDocument.AFTER
+    )
\ No newline at end of file
@@ -0,0 +1,217 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, PyMongoError
+from database import tickets_collection, ticket_events_collection, counters_collection
+from config import TICKET_EVENTS_GAP_TIMEOUT_SECONDS, TICKET_EVENTS_APPEND_ATTEMPTS, TICKET_CHANGE_STREAM_WAIT_MS
+
+logger = logging.getLogger(__name__)
+
+EVENT_COUNTER = "ticket_events"
+DUPLICATE_KEY = 11000
+APPEND_RETRY_DELAY = 0.1
+COMMIT_SCAN_SIZE = 1000
+KEPT_SKIPPED = 100
+
+CHANGE_STREAM_TYPES = {
+    "insert": "created",
+    "update": "updated",
+    "replace": "replaced",
+    "delete": "deleted",
+}
+
+def ticket_event(event_type: str, ticket: dict, changes: Optional[dict] = None, previous: Optional[dict] = None) -> dict:
+    return {
+        "ticket_id": ticket["_id"],
+        "tenant_id": ticket.get("tenant_id"),
+        "type": event_type,
+        "changes": changes,
+        "previous": previous,
+        "at": datetime.utcnow()
+    }
+
+def previous_values(ticket: dict, changes: dict) -> dict:
+    return {field: ticket.get(field) for field in changes if field != "updated_at"}
+
+async def _reserve(count: int) -> int:
+    counter = await counters_collection.find_one_and_update(
+        {"_id": EVENT_COUNTER},
+        {"$inc": {"seq": count}, "$setOnInsert": {"committed": 0}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return counter["seq"] - count + 1
+
+async def _insert(events: List[dict]):
+    try:
+        await ticket_events_collection.insert_many(events, ordered=False)
+    except BulkWriteError as e:
+        # A retry after a lost acknowledgement finds its own events already there
+        if any(error["code"] != DUPLICATE_KEY for error in e.details["writeErrors"]):
+            raise
+
+async def _wait_or_skip_gap(committed: int, next_seq: int) -> bool:
+    # The gap timer runs on the server clock: it starts when a reader first
+    # sees the gap, and both ends are stamped with $currentDate.
+    counter = await counters_collection.find_one_and_update(
+        {"_id": EVENT_COUNTER, "committed": committed},
+        {"$currentDate": {"checked_at": True}},
+        return_document=ReturnDocument.AFTER
+    )
+    if not counter:
+        return True
+    if counter.get("gap_seq") != committed + 1:
+        await counters_collection.update_one(
+            {"_id": EVENT_COUNTER, "committed": committed},
+            {"$set": {"gap_seq": committed + 1, "gap_since": counter["checked_at"]}}
+        )
+        return False
+    if counter["checked_at"] - counter["gap_since"] < timedelta(seconds=TICKET_EVENTS_GAP_TIMEOUT_SECONDS):
+        return False
+    result = await counters_collection.update_one(
+        {"_id": EVENT_COUNTER, "committed": committed, "gap_seq": committed + 1},
+        {
+            "$set": {"committed": next_seq - 1},
+            "$push": {"skipped": {"$each": list(range(committed + 1, next_seq)), "$slice": -KEPT_SKIPPED}}
+        }
+    )
+    if result.modified_count:
+        logger.warning(f"Skipped ticket events {committed + 1}-{next_seq - 1} that were reserved but not written")
+    return True
+
+async def commit_position() -> Tuple[int, list]:
+    # Events are keyed by a sequence reserved from the counter document, but
+    # inserts can land out of order. The committed mark only moves over a
+    # contiguous run, so readers never pass a reserved number still in flight.
+    # A gap that outlives the timeout is skipped and remembered, in case its
+    # append still lands later.
+    while True:
+        counter = await counters_collection.find_one({"_id": EVENT_COUNTER})
+        if not counter:
+            return 0, []
+        committed = position = counter["committed"]
+        next_seq = None
+        async for event in ticket_events_collection.find({"_id": {"$gt": committed}}, {"_id": 1}).sort("_id", 1).limit(COMMIT_SCAN_SIZE):
+            if event["_id"] != position + 1:
+                next_seq = event["_id"]
+                break
+            position = event["_id"]
+        if position > committed:
+            await counters_collection.update_one(
+                {"_id": EVENT_COUNTER, "committed": committed},
+                {"$set": {"committed": position}}
+            )
+        elif next_seq is None or not await _wait_or_skip_gap(committed, next_seq):
+            return committed, counter.get("skipped") or []
+
+async def _redeliver_late(skipped: list) -> int:
+    # An append that lands after its gap was skipped sits below the committed
+    # mark. Whoever deletes it first appends it again under a new number.
+    moved = 0
+    async for event in ticket_events_collection.find({"_id": {"$in": skipped}}):
+        result = await ticket_events_collection.delete_one({"_id": event["_id"]})
+        await counters_collection.update_one({"_id": EVENT_COUNTER}, {"$pull": {"skipped": event["_id"]}})
+        if result.deleted_count:
+            del event["_id"]
+            await record_events([event])
+            moved += 1
+    return moved
+
+async def record_events(events: List[dict]):
+    # Runs after the ticket write has landed, so a failure here is logged
+    # instead of turning a successful request into an error.
+    if not events:
+        return
+    try:
+        first = await _reserve(len(events))
+    except PyMongoError as e:
+        logger.error(f"Failed to reserve {len(events)} ticket events: {str(e)}")
+        return
+    for seq, event in enumerate(events, first):
+        event["_id"] = seq
+
+    for attempt in range(1, TICKET_EVENTS_APPEND_ATTEMPTS + 1):
+        try:
+            await _insert(events)
+            return
+        except PyMongoError as e:
+            if attempt == TICKET_EVENTS_APPEND_ATTEMPTS:
+                logger.error(f"Dropping ticket events {first}-{first + len(events) - 1} after {attempt} attempts: {str(e)}")
+                return
+            logger.warning(f"Retrying append of ticket events {first}-{first + len(events) - 1}: {str(e)}")
+            await asyncio.sleep(APPEND_RETRY_DELAY * attempt)
+
+def _plain(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+async def read_log(since: int, limit: int, tenant_id: Optional[str], ticket_id: Optional[ObjectId]) -> Tuple[list, str]:
+    committed, skipped = await commit_position()
+    if skipped and await _redeliver_late(skipped):
+        committed, _ = await commit_position()
+    query = {"_id": {"$gt": since, "$lte": committed}}
+    if tenant_id:
+        query["tenant_id"] = tenant_id
+    if ticket_id:
+        query["ticket_id"] = ticket_id
+
+    events = []
+    async for event in ticket_events_collection.find(query).sort("_id", 1).limit(limit):
+        event = _plain(event)
+        event["id"] = str(event.pop("_id"))
+        events.append(event)
+    # A short page means every committed event up to the mark has been seen
+    next_token = events[-1]["id"] if len(events) == limit else str(max(committed, since))
+    return events, next_token
+
+def _from_change(change: dict) -> dict:
+    event_type = CHANGE_STREAM_TYPES.get(change["operationType"], change["operationType"])
+    ticket_id = change.get("documentKey", {}).get("_id")
+    changes = None
+    if event_type == "created":
+        document = change.get("fullDocument") or {}
+        changes = {field: document.get(field) for field in ("status", "category", "tenant_id", "reported_by")}
+    elif event_type == "updated":
+        description = change.get("updateDescription") or {}
+        changes = description.get("updatedFields") or {}
+        if description.get("removedFields"):
+            changes = {**changes, **{field: None for field in description["removedFields"]}}
+    return _plain({
+        "id": change["_id"]["_data"],
+        "ticket_id": ticket_id,
+        "tenant_id": (change.get("fullDocument") or {}).get("tenant_id"),
+        "type": event_type,
+        "changes": changes,
+        "previous": None,
+        "at": change["clusterTime"].as_datetime().replace(tzinfo=None)
+    })
+
+async def read_change_stream(since: Optional[str], limit: int, tenant_id: Optional[str], ticket_id: Optional[ObjectId]) -> Tuple[list, Optional[str]]:
+    match = {}
+    if tenant_id:
+        match["fullDocument.tenant_id"] = tenant_id
+    if ticket_id:
+        match["documentKey._id"] = ticket_id
+
+    events = []
+    async with tickets_collection.watch(
+        [{"$match": match}] if match else None,
+        full_document="updateLookup",
+        resume_after={"_data": since} if since else None,
+        max_await_time_ms=TICKET_CHANGE_STREAM_WAIT_MS
+    ) as stream:
+        while len(events) < limit:
+            change = await stream.try_next()
+            if change is None:
+                break
+            events.append(_from_change(change))
+        token = stream.resume_token
+    return events, token["_data"] if token else since
\ No newline at end of file
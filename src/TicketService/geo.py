@@ -0,0 +1,128 @@
+import logging
+import math
+from typing import Optional, Tuple
+from pymongo import UpdateOne
+from database import tickets_collection
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_M = 6378100
+BACKFILL_BATCH_SIZE = 500
+CLUSTER_CELLS_PER_TILE = 4
+BOX_MAX_SPAN = 90
+BOX_EDGE_STEP = 1.0
+POLE_LATITUDE = 89.9999
+
+def location_point(location: dict) -> Optional[dict]:
+    lat, lon = location.get("lat"), location.get("lon")
+    if not isinstance(lat, (int, float)) or not isinstance(lon, (int, float)):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        return None
+    return {"type": "Point", "coordinates": [lon, lat]}
+
+def parse_bbox(bbox: str) -> Tuple[float, float, float, float]:
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(value) for value in bbox.split(","))
+    except ValueError:
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat")
+    if not (-180 <= min_lon < max_lon <= 180 and -90 <= min_lat < max_lat <= 90):
+        raise ValueError("bbox is out of range")
+    return min_lon, min_lat, max_lon, max_lat
+
+def parse_near(near: str) -> Tuple[float, float]:
+    try:
+        lat, lon = (float(value) for value in near.split(","))
+    except ValueError:
+        raise ValueError("near must be lat,lon")
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError("near is out of range")
+    return lat, lon
+
+def _edge(start: list, end: list) -> list:
+    steps = max(1, math.ceil(max(abs(end[0] - start[0]), abs(end[1] - start[1])) / BOX_EDGE_STEP))
+    return [
+        [start[0] + (end[0] - start[0]) * i / steps, start[1] + (end[1] - start[1]) * i / steps]
+        for i in range(steps)
+    ]
+
+def _box_polygon(min_lon: float, min_lat: float, max_lon: float, max_lat: float) -> dict:
+    # GeoJSON edges are great circles, so a four-corner box bulges away from the
+    # parallels a map viewport shows. Short steps keep every edge on its parallel.
+    corners = [[min_lon, min_lat], [max_lon, min_lat], [max_lon, max_lat], [min_lon, max_lat]]
+    ring = []
+    for i, corner in enumerate(corners):
+        ring += _edge(corner, corners[(i + 1) % 4])
+    ring.append(corners[0])
+    return {"type": "Polygon", "coordinates": [ring]}
+
+def bbox_filter(min_lon: float, min_lat: float, max_lon: float, max_lat: float) -> dict:
+    min_lat, max_lat = max(min_lat, -POLE_LATITUDE), min(max_lat, POLE_LATITUDE)
+    # MongoDB reads a single ring larger than a hemisphere as its complement, so
+    # wide boxes (zoomed-out views) are split into strips of at most BOX_MAX_SPAN.
+    strips = math.ceil((max_lon - min_lon) / BOX_MAX_SPAN)
+    width = (max_lon - min_lon) / strips
+    boxes = [
+        {"point": {"$geoWithin": {"$geometry": _box_polygon(
+            min_lon + width * i, min_lat, max_lon if i == strips - 1 else min_lon + width * (i + 1), max_lat
+        )}}}
+        for i in range(strips)
+    ]
+    if len(boxes) == 1:
+        return boxes[0]
+    return {"$and": [{"$or": boxes}]}
+
+def near_filter(lat: float, lon: float, radius_m: float) -> dict:
+    return {"point": {"$geoWithin": {"$centerSphere": [[lon, lat], radius_m / EARTH_RADIUS_M]}}}
+
+def cluster_cell_size(zoom: int, min_lon: float, min_lat: float, max_lon: float, max_lat: float, max_cells: int) -> Tuple[float, float]:
+    cell_lon = 360 / (2 ** zoom) / CLUSTER_CELLS_PER_TILE
+    cell_lat = cell_lon * math.cos(math.radians((min_lat + max_lat) / 2))
+    while math.ceil((max_lon - min_lon) / cell_lon) * math.ceil((max_lat - min_lat) / cell_lat) > max_cells:
+        cell_lon *= 2
+        cell_lat *= 2
+    return cell_lon, cell_lat
+
+def cluster_pipeline(query: dict, cell_lon: float, cell_lat: float) -> list:
+    lon = {"$arrayElemAt": ["$point.coordinates", 0]}
+    lat = {"$arrayElemAt": ["$point.coordinates", 1]}
+    return [
+        {"$match": query},
+        {"$project": {"lon": lon, "lat": lat}},
+        {"$group": {
+            "_id": {
+                "x": {"$floor": {"$divide": ["$lon", cell_lon]}},
+                "y": {"$floor": {"$divide": ["$lat", cell_lat]}}
+            },
+            "count": {"$sum": 1},
+            "lon": {"$avg": "$lon"},
+            "lat": {"$avg": "$lat"},
+            "ticket_id": {"$first": "$_id"}
+        }},
+        {"$project": {
+            "_id": 0,
+            "count": 1,
+            "lat": 1,
+            "lon": 1,
+            "ticket_id": {"$cond": [{"$eq": ["$count", 1]}, {"$toString": "$ticket_id"}, None]}
+        }}
+    ]
+
+async def backfill_points():
+    updated = skipped = 0
+    batch = []
+    async for ticket in tickets_collection.find({"point": {"$exists": False}}, {"location": 1}):
+        point = location_point(ticket.get("location") or {})
+        if point is None:
+            skipped += 1
+            logger.warning(f"Skipping ticket {ticket['_id']}: invalid location")
+            continue
+        batch.append(UpdateOne({"_id": ticket["_id"]}, {"$set": {"point": point}}))
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            await tickets_collection.bulk_write(batch, ordered=False)
+            updated += len(batch)
+            batch = []
+    if batch:
+        await tickets_collection.bulk_write(batch, ordered=False)
+        updated += len(batch)
+    logger.info(f"Backfilled points on {updated} tickets, skipped {skipped}")
\ No newline at end of file
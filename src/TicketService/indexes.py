@@ -0,0 +1,76 @@
+from datetime import datetime
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, GEOSPHERE, TEXT, IndexModel
+from common import mongo_indexes
+from database import tickets_collection, comments_collection, ticket_events_collection
+from geo import bbox_filter, near_filter
+from duplicates import duplicate_query, reporter_filter
+from config import TICKETS_SEARCH_LANGUAGE
+
+NEWEST_FIRST = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+INDEXES = [
+    (tickets_collection, [
+        IndexModel(NEWEST_FIRST, name="created_at_id"),
+        IndexModel([("tenant_id", ASCENDING)] + NEWEST_FIRST, name="tenant_created_at_id"),
+        IndexModel([("reported_by", ASCENDING)] + NEWEST_FIRST, name="reporter_created_at_id"),
+        IndexModel([("reporters", ASCENDING)] + NEWEST_FIRST, name="reporters_created_at_id"),
+        IndexModel([("status", ASCENDING)] + NEWEST_FIRST, name="status_created_at_id"),
+        IndexModel([("tenant_id", ASCENDING), ("status", ASCENDING)] + NEWEST_FIRST, name="tenant_status_created_at_id"),
+        IndexModel([("point", GEOSPHERE)], name="point_2dsphere"),
+        IndexModel([("tenant_id", ASCENDING), ("point", GEOSPHERE)], name="tenant_point_2dsphere"),
+        IndexModel(
+            [("tenant_id", ASCENDING), ("category", ASCENDING), ("status", ASCENDING), ("point", GEOSPHERE), ("created_at", DESCENDING)],
+            name="duplicate_candidates"
+        ),
+        IndexModel(
+            [("needs_review", ASCENDING)] + NEWEST_FIRST,
+            name="needs_review_created_at_id",
+            partialFilterExpression={"needs_review": True}
+        ),
+        IndexModel(
+            [("title", TEXT), ("description", TEXT), ("location.address", TEXT)],
+            name="ticket_text",
+            weights={"title": 10, "location.address": 5, "description": 1},
+            default_language=TICKETS_SEARCH_LANGUAGE,
+            language_override="search_language"
+        ),
+    ]),
+    (comments_collection, [
+        IndexModel([("ticket_id", ASCENDING)] + NEWEST_FIRST, name="ticket_created_at_id"),
+    ]),
+    (ticket_events_collection, [
+        IndexModel([("tenant_id", ASCENDING), ("_id", ASCENDING)], name="tenant_id_id"),
+        IndexModel([("ticket_id", ASCENDING), ("_id", ASCENDING)], name="ticket_id_id"),
+    ]),
+]
+
+ROUTE_QUERIES = [
+    ("GET /tickets/list", tickets_collection, {}, NEWEST_FIRST),
+    ("GET /tickets/list?tenant_id", tickets_collection, {"tenant_id": "tenant"}, NEWEST_FIRST),
+    ("GET /tickets/list?user_id", tickets_collection, reporter_filter("user"), NEWEST_FIRST),
+    ("GET /tickets/list?status", tickets_collection, {"status": "pending"}, NEWEST_FIRST),
+    ("GET /tickets/list?tenant_id&status", tickets_collection, {"tenant_id": "tenant", "status": "pending"}, NEWEST_FIRST),
+    ("GET /tickets/list?needs_review", tickets_collection, {"needs_review": True}, NEWEST_FIRST),
+    ("GET /tickets/list?bbox", tickets_collection, bbox_filter(12.4, 41.8, 12.6, 42.0), NEWEST_FIRST),
+    ("GET /tickets/clusters world view", tickets_collection, bbox_filter(-180, -85, 180, 85), None),
+    ("GET /tickets/list?near&radius_m", tickets_collection, near_filter(41.9, 12.5, 500), NEWEST_FIRST),
+    ("GET /tickets/search", tickets_collection, {"$text": {"$search": "buca"}}, None),
+    ("GET /tickets/search?tenant_id", tickets_collection, {"$text": {"$search": "buca"}, "tenant_id": "tenant"}, None),
+    ("POST /tickets/create duplicate check", tickets_collection, duplicate_query({
+        "tenant_id": "tenant",
+        "category": "pothole",
+        "point": {"type": "Point", "coordinates": [12.5, 41.9]},
+        "created_at": datetime(2024, 1, 1)
+    }), None),
+    ("GET /tickets/{id}/comments", comments_collection, {"ticket_id": "ticket"}, NEWEST_FIRST),
+    ("GET /tickets/changes?tenant_id", ticket_events_collection, {"tenant_id": "tenant", "_id": {"$gt": 0, "$lte": 100}}, [("_id", ASCENDING)]),
+    ("GET /tickets/changes?ticket_id", ticket_events_collection, {"ticket_id": ObjectId(), "_id": {"$gt": 0, "$lte": 100}}, [("_id", ASCENDING)]),
+    ("GET /tickets/list?tenant_id&bbox", tickets_collection, {"tenant_id": "tenant", **bbox_filter(12.4, 41.8, 12.6, 42.0)}, NEWEST_FIRST),
+]
+
+async def ensure_indexes():
+    await mongo_indexes.ensure_indexes(INDEXES)
+
+async def check_indexes() -> bool:
+    return await mongo_indexes.check_indexes(ROUTE_QUERIES)
\ No newline at end of file
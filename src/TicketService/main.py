@@ -4,6 +4,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from routes import router
+from indexes import ensure_indexes, check_indexes
+from geo import backfill_points
+from comments import migrate_comments
+from notifications import start_client, close_client
 
 load_dotenv()
 
@@ -37,12 +41,36 @@ async def health_check():
 @app.on_event("startup")
 async def startup_event():
     logger.info("Ticket Service starting up...")
+    await ensure_indexes()
+    start_client()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Ticket Service shutting down...")
+    await close_client()
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--check-indexes", action="store_true", help="explain every route query and report collection scans")
+    parser.add_argument("--backfill-points", action="store_true", help="store a GeoJSON point on tickets created before geo queries")
+    parser.add_argument("--migrate-comments", action="store_true", help="move embedded ticket comments into the ticket_comments collection")
+    args = parser.parse_args()
+    
+    if args.check_indexes:
+        import asyncio
+        raise SystemExit(0 if asyncio.run(check_indexes()) else 1)
+    
+    if args.backfill_points:
+        import asyncio
+        asyncio.run(backfill_points())
+        raise SystemExit(0)
+    
+    if args.migrate_comments:
+        import asyncio
+        asyncio.run(migrate_comments())
+        raise SystemExit(0)
+    
     import uvicorn
     port = int(os.getenv("PORT", 8003))
     uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 class Location(BaseModel):
@@ -22,7 +22,31 @@ class TicketUpdate(BaseModel):
     category: Optional[str] = None
     assigned_to: Optional[str] = None
 
+class DuplicateReview(BaseModel):
+    action: str = Field(pattern="^(dismiss|merge)$")
+
+class BulkTicketFilter(BaseModel):
+    tenant_id: Optional[str] = None
+    status: Optional[str] = None
+    category: Optional[str] = None
+    assigned_to: Optional[str] = None
+
+class BulkTicketUpdate(BaseModel):
+    ids: Optional[List[str]] = Field(None, min_length=1, max_length=1000)
+    filter: Optional[BulkTicketFilter] = None
+    update: TicketUpdate
+
+class BulkTicketResult(BaseModel):
+    id: str
+    result: str
+
+class BulkTicketUpdateResponse(BaseModel):
+    matched: int
+    modified: int
+    results: List[BulkTicketResult]
+
 class Comment(BaseModel):
+    id: Optional[str] = None
     user_id: str
     message: str
     created_at: datetime
@@ -39,6 +63,10 @@ class TicketResponse(BaseModel):
     images: List[str] = []
     tenant_id: str
     comments: List[Comment] = []
+    comment_count: int = 0
+    duplicate_of: Optional[str] = None
+    duplicate_count: int = 0
+    needs_review: bool = False
     feedback: Optional[dict] = None
     created_at: datetime
     updated_at: datetime
@@ -51,6 +79,72 @@ class CommentCreate(BaseModel):
     message: str
     user_id: str
 
+class CommentResponse(BaseModel):
+    id: str = Field(alias="_id")
+    ticket_id: str
+    user_id: str
+    message: str
+    created_at: datetime
+    
+    class Config:
+        populate_by_name = True
+        from_attributes = True
+
 class FeedbackCreate(BaseModel):
     rating: int = Field(ge=1, le=5)
-    comment: Optional[str] = None
\ No newline at end of file
+    comment: Optional[str] = None
+
+class TicketCluster(BaseModel):
+    lat: float
+    lon: float
+    count: int
+    ticket_id: Optional[str] = None
+
+class TicketClusters(BaseModel):
+    zoom: int
+    cell_lon: float
+    cell_lat: float
+    total: int
+    clusters: List[TicketCluster]
+
+class SearchSnippet(BaseModel):
+    field: str
+    text: str
+    highlights: List[List[int]]
+    truncated_start: bool
+    truncated_end: bool
+
+class TicketSearchHit(BaseModel):
+    id: str = Field(alias="_id")
+    title: str
+    status: str
+    category: str
+    tenant_id: str
+    location: Location
+    created_at: datetime
+    score: float
+    snippets: List[SearchSnippet]
+    
+    class Config:
+        populate_by_name = True
+        from_attributes = True
+
+class TicketSearchResults(BaseModel):
+    query: str
+    results: List[TicketSearchHit]
+    next_offset: Optional[int] = None
+
+class TicketEvent(BaseModel):
+    id: str
+    ticket_id: str
+    tenant_id: Optional[str] = None
+    type: str
+    changes: Optional[Dict[str, Any]] = None
+    previous: Optional[Dict[str, Any]] = None
+    at: datetime
+
+class TicketChanges(BaseModel):
+    source: str
+    events: List[TicketEvent]
+    next: Optional[str] = None
+    has_more: bool
\ No newline at end of file
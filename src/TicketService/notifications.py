@@ -0,0 +1,42 @@
+import logging
+from typing import List, Optional
+import httpx
+from config import NOTIFICATION_SERVICE_URL, NOTIFICATION_SERVICE_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+ENQUEUE_BATCH_SIZE = 1000
+
+STATUS_TYPES = {
+    "completed": "success",
+    "rejected": "warning",
+}
+
+_client: Optional[httpx.AsyncClient] = None
+
+def start_client():
+    global _client
+    _client = httpx.AsyncClient(base_url=NOTIFICATION_SERVICE_URL, timeout=NOTIFICATION_SERVICE_TIMEOUT)
+
+async def close_client():
+    global _client
+    if _client:
+        await _client.aclose()
+        _client = None
+
+def status_notification(ticket: dict, new_status: str) -> dict:
+    return {
+        "user_id": ticket["reported_by"],
+        "message": f"Your ticket \"{ticket['title']}\" is now {new_status.replace('_', ' ')}",
+        "type": STATUS_TYPES.get(new_status, "info"),
+        "ticket_id": str(ticket["_id"])
+    }
+
+async def enqueue_notifications(notifications: List[dict]):
+    for start in range(0, len(notifications), ENQUEUE_BATCH_SIZE):
+        batch = notifications[start:start + ENQUEUE_BATCH_SIZE]
+        try:
+            response = await _client.post("/notify/enqueue-batch", json={"notifications": batch})
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to enqueue {len(batch)} notifications: {str(e)}")
\ No newline at end of file
@@ -1,37 +1,92 @@
-from fastapi import APIRouter, HTTPException, status, Query
+from fastapi import APIRouter, HTTPException, status, Query, Response, BackgroundTasks
+from fastapi import status as http_status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
-from models import TicketCreate, TicketUpdate, TicketResponse, CommentCreate, FeedbackCreate, Comment
-from database import tickets_collection
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import OperationFailure
+from models import TicketCreate, TicketUpdate, TicketResponse, CommentCreate, FeedbackCreate, CommentResponse, TicketCluster, TicketClusters, TicketSearchHit, TicketSearchResults, BulkTicketUpdate, BulkTicketUpdateResponse, DuplicateReview, BulkTicketResult, TicketEvent, TicketChanges
+from database import tickets_collection, comments_collection
+from comments import attach_comment
+from search import search_terms, snippets
+from duplicates import find_duplicate, attach_duplicate, reporter_filter
+from config import TICKETS_PAGE_SIZE, TICKETS_MAX_PAGE_SIZE, TICKETS_MAX_RADIUS_M, TICKETS_MAX_CLUSTER_CELLS, COMMENTS_PAGE_SIZE, COMMENTS_MAX_PAGE_SIZE, TICKETS_SEARCH_PAGE_SIZE, TICKETS_SEARCH_MAX_OFFSET, DUPLICATE_ACTION, TICKETS_BULK_MAX, TICKET_EVENTS_SOURCE, TICKET_EVENTS_PAGE_SIZE, TICKET_EVENTS_MAX_PAGE_SIZE
+from pagination import encode_cursor, decode_cursor, cursor_filter
+from stats import record_ticket_created, record_ticket_changed, record_tickets_changed, DIMENSIONS
+from notifications import status_notification, enqueue_notifications
+from events import ticket_event, previous_values, record_events, read_log, read_change_stream
+from geo import location_point, parse_bbox, parse_near, bbox_filter, near_filter, cluster_cell_size, cluster_pipeline
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+TICKET_FIELDS = set(TicketResponse.model_fields) - {"id"}
+
+def add_filter(query: dict, condition: dict):
+    for key, value in condition.items():
+        if key == "$and":
+            query.setdefault("$and", []).extend(value)
+        else:
+            query[key] = value
+
 @router.post("/create", response_model=TicketResponse, status_code=status.HTTP_201_CREATED)
-async def create_ticket(ticket: TicketCreate, user_id: str = Query(...)):
+async def create_ticket(ticket: TicketCreate, response: Response, user_id: str = Query(...)):
     logger.info(f"Creating ticket: {ticket.title}")
     
     ticket_dict = ticket.model_dump()
     ticket_dict["reported_by"] = user_id
     ticket_dict["status"] = "pending"
     ticket_dict["comments"] = []
+    ticket_dict["comment_count"] = 0
     ticket_dict["feedback"] = None
     ticket_dict["created_at"] = datetime.utcnow()
     ticket_dict["updated_at"] = datetime.utcnow()
+    point = location_point(ticket_dict["location"])
+    if point:
+        ticket_dict["point"] = point
+    
+    duplicate = await find_duplicate(ticket_dict) if DUPLICATE_ACTION != "off" else None
+    if duplicate:
+        logger.info(f"Ticket looks like a duplicate of {duplicate['_id']}")
+        response.headers["X-Duplicate-Of"] = str(duplicate["_id"])
+        if DUPLICATE_ACTION == "attach":
+            existing_ticket = await attach_duplicate(duplicate["_id"], ticket_dict)
+            if existing_ticket:
+                await record_events([ticket_event("duplicate_attached", existing_ticket, {
+                    "duplicate_count": existing_ticket.get("duplicate_count"),
+                    "reported_by": user_id
+                })])
+                response.status_code = status.HTTP_200_OK
+                existing_ticket["_id"] = str(existing_ticket["_id"])
+                return TicketResponse(**existing_ticket)
+        ticket_dict["duplicate_of"] = str(duplicate["_id"])
+        ticket_dict["needs_review"] = True
     
     result = await tickets_collection.insert_one(ticket_dict)
-    created_ticket = await tickets_collection.find_one({"_id": result.inserted_id})
+    await record_ticket_created(ticket_dict)
+    await record_events([ticket_event("created", ticket_dict, {
+        field: ticket_dict.get(field) for field in ("status", "category", "reported_by", "duplicate_of")
+    })])
     
-    created_ticket["_id"] = str(created_ticket["_id"])
-    return TicketResponse(**created_ticket)
+    ticket_dict["_id"] = str(result.inserted_id)
+    return TicketResponse(**ticket_dict)
 
 @router.get("/list", response_model=List[TicketResponse])
 async def get_tickets(
+    response: Response,
     tenant_id: Optional[str] = None,
     user_id: Optional[str] = None,
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    needs_review: Optional[bool] = None,
+    limit: Optional[int] = Query(None, ge=1, le=TICKETS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    bbox: Optional[str] = None,
+    near: Optional[str] = None,
+    radius_m: Optional[float] = Query(None, gt=0, le=TICKETS_MAX_RADIUS_M)
 ):
     logger.info(f"Fetching tickets - tenant_id: {tenant_id}, user_id: {user_id}, status: {status}")
     
@@ -39,16 +94,208 @@ async def get_tickets(
     if tenant_id:
         query["tenant_id"] = tenant_id
     if user_id:
-        query["reported_by"] = user_id
+        add_filter(query, reporter_filter(user_id))
+    if status:
+        query["status"] = status
+    if needs_review:
+        query["needs_review"] = True
+    
+    if bbox and near:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail="Use either bbox or near, not both"
+        )
+    try:
+        if bbox:
+            add_filter(query, bbox_filter(*parse_bbox(bbox)))
+        if near:
+            if radius_m is None:
+                raise ValueError("near requires radius_m")
+            query.update(near_filter(*parse_near(near), radius_m))
+        elif radius_m is not None:
+            raise ValueError("radius_m requires near")
+    except ValueError as e:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    if cursor:
+        position = decode_cursor(cursor)
+        if not position:
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        query.update(cursor_filter(*position))
+    
+    projection = None
+    if fields:
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown = requested - TICKET_FIELDS
+        if unknown:
+            raise HTTPException(
+                status_code=http_status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+            )
+        projection = {field: 1 for field in requested | {"created_at"}}
+    
+    ticket_cursor = tickets_collection.find(query, projection).sort(
+        [("created_at", -1), ("_id", -1)]
+    )
+    # Clients that predate paging ask for neither limit nor cursor and expect the full list
+    if limit is None and not cursor:
+        documents = await ticket_cursor.to_list(length=None)
+    else:
+        limit = limit or TICKETS_PAGE_SIZE
+        documents = await ticket_cursor.limit(limit + 1).to_list(length=limit + 1)
+    
+    headers = {}
+    if limit and len(documents) > limit:
+        documents = documents[:limit]
+        last = documents[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last["created_at"], last["_id"])
+    
+    for ticket in documents:
+        ticket["_id"] = str(ticket["_id"])
+    
+    if projection:
+        return JSONResponse(content=jsonable_encoder(documents), headers=headers)
+    
+    response.headers.update(headers)
+    return [TicketResponse(**ticket) for ticket in documents]
+
+@router.get("/clusters", response_model=TicketClusters)
+async def get_ticket_clusters(
+    bbox: str,
+    zoom: int = Query(..., ge=0, le=22),
+    tenant_id: Optional[str] = None,
+    status: Optional[str] = None,
+    category: Optional[str] = None
+):
+    logger.info(f"Clustering tickets - bbox: {bbox}, zoom: {zoom}, tenant_id: {tenant_id}")
+    
+    try:
+        bounds = parse_bbox(bbox)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    query = bbox_filter(*bounds)
+    if tenant_id:
+        query["tenant_id"] = tenant_id
+    if status:
+        query["status"] = status
+    if category:
+        query["category"] = category
+    
+    cell_lon, cell_lat = cluster_cell_size(zoom, *bounds, TICKETS_MAX_CLUSTER_CELLS)
+    clusters = [
+        TicketCluster(**cluster)
+        async for cluster in tickets_collection.aggregate(cluster_pipeline(query, cell_lon, cell_lat))
+    ]
+    
+    return TicketClusters(
+        zoom=zoom,
+        cell_lon=cell_lon,
+        cell_lat=cell_lat,
+        total=sum(cluster.count for cluster in clusters),
+        clusters=clusters
+    )
+
+@router.get("/search", response_model=TicketSearchResults)
+async def search_tickets(
+    q: str = Query(..., min_length=1, max_length=200),
+    tenant_id: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = Query(TICKETS_SEARCH_PAGE_SIZE, ge=1, le=TICKETS_MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, le=TICKETS_SEARCH_MAX_OFFSET)
+):
+    logger.info(f"Searching tickets - q: {q}, tenant_id: {tenant_id}")
+    
+    terms = search_terms(q)
+    if not terms:
+        raise HTTPException(
+            status_code=http_status.HTTP_400_BAD_REQUEST,
+            detail="Search query has no terms"
+        )
+    
+    query = {"$text": {"$search": q}}
+    if tenant_id:
+        query["tenant_id"] = tenant_id
     if status:
         query["status"] = status
     
-    tickets = []
-    async for ticket in tickets_collection.find(query).sort("created_at", -1):
+    projection = {
+        "title": 1,
+        "description": 1,
+        "status": 1,
+        "category": 1,
+        "tenant_id": 1,
+        "location": 1,
+        "created_at": 1,
+        "score": {"$meta": "textScore"}
+    }
+    documents = await tickets_collection.find(query, projection).sort(
+        [("score", {"$meta": "textScore"}), ("_id", -1)]
+    ).skip(offset).limit(limit + 1).to_list(length=limit + 1)
+    
+    next_offset = None
+    if len(documents) > limit:
+        documents = documents[:limit]
+        if offset + limit <= TICKETS_SEARCH_MAX_OFFSET:
+            next_offset = offset + limit
+    
+    results = []
+    for ticket in documents:
         ticket["_id"] = str(ticket["_id"])
-        tickets.append(TicketResponse(**ticket))
+        results.append(TicketSearchHit(**ticket, snippets=snippets(ticket, terms)))
     
-    return tickets
+    return TicketSearchResults(query=q, results=results, next_offset=next_offset)
+
+@router.get("/changes", response_model=TicketChanges)
+async def get_ticket_changes(
+    since: Optional[str] = None,
+    tenant_id: Optional[str] = None,
+    ticket_id: Optional[str] = None,
+    limit: int = Query(TICKET_EVENTS_PAGE_SIZE, ge=1, le=TICKET_EVENTS_MAX_PAGE_SIZE)
+):
+    logger.info(f"Fetching ticket changes - since: {since}, tenant_id: {tenant_id}, source: {TICKET_EVENTS_SOURCE}")
+    
+    obj_id = None
+    if ticket_id:
+        if not ObjectId.is_valid(ticket_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid ticket ID format"
+            )
+        obj_id = ObjectId(ticket_id)
+    
+    if TICKET_EVENTS_SOURCE == "changestream":
+        try:
+            events, next_token = await read_change_stream(since, limit, tenant_id, obj_id)
+        except OperationFailure as e:
+            logger.warning(f"Change stream rejected token {since}: {str(e)}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid or expired change token"
+            )
+    else:
+        if since and not (since.isdigit() and since.isascii()):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid change token"
+            )
+        events, next_token = await read_log(int(since) if since else 0, limit, tenant_id, obj_id)
+    
+    return TicketChanges(
+        source=TICKET_EVENTS_SOURCE,
+        events=[TicketEvent(**event) for event in events],
+        next=next_token,
+        has_more=len(events) == limit
+    )
 
 @router.get("/{ticket_id}", response_model=TicketResponse)
 async def get_ticket(ticket_id: str):
@@ -71,6 +318,105 @@ async def get_ticket(ticket_id: str):
     ticket["_id"] = str(ticket["_id"])
     return TicketResponse(**ticket)
 
+@router.patch("/bulk", response_model=BulkTicketUpdateResponse)
+async def bulk_update_tickets(bulk: BulkTicketUpdate, background_tasks: BackgroundTasks):
+    if (bulk.ids is None) == (bulk.filter is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide either ids or filter"
+        )
+    
+    update_data = bulk.update.model_dump(exclude_unset=True)
+    if not update_data:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields to update"
+        )
+    
+    results = {}
+    if bulk.ids is not None:
+        obj_ids = []
+        for ticket_id in bulk.ids:
+            if ObjectId.is_valid(ticket_id):
+                obj_ids.append(ObjectId(ticket_id))
+            else:
+                results[ticket_id] = "invalid_id"
+        query = {"_id": {"$in": obj_ids}}
+    else:
+        query = bulk.filter.model_dump(exclude_none=True)
+        if not query:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Filter needs at least one field"
+            )
+    
+    logger.info(f"Bulk updating tickets - {len(bulk.ids) if bulk.ids is not None else query}: {update_data}")
+    
+    projection = {field: 1 for field in ["title", "reported_by", *DIMENSIONS, *update_data]}
+    previous_tickets = await tickets_collection.find(query, projection).limit(TICKETS_BULK_MAX + 1).to_list(length=TICKETS_BULK_MAX + 1)
+    if len(previous_tickets) > TICKETS_BULK_MAX:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Filter matches more than {TICKETS_BULK_MAX} tickets"
+        )
+    
+    changed_tickets = [
+        ticket for ticket in previous_tickets
+        if any(ticket.get(field) != value for field, value in update_data.items())
+    ]
+    updated_tickets = []
+    if changed_tickets:
+        update_data["updated_at"] = datetime.utcnow()
+        # Each write only lands if the ticket still holds the values read above,
+        # so stats deltas, events and notifications match what was overwritten.
+        result = await tickets_collection.bulk_write([
+            UpdateOne(
+                {"_id": ticket["_id"], **{field: ticket.get(field) for field in update_data if field != "updated_at"}},
+                {"$set": update_data}
+            )
+            for ticket in changed_tickets
+        ], ordered=False)
+        updated_tickets = changed_tickets
+        if result.matched_count < len(changed_tickets):
+            # Some tickets changed in between. The ones written here carry this updated_at.
+            written = await tickets_collection.find(
+                {"_id": {"$in": [ticket["_id"] for ticket in changed_tickets]}, "updated_at": update_data["updated_at"]},
+                {"_id": 1}
+            ).to_list(length=None)
+            written_ids = {ticket["_id"] for ticket in written}
+            updated_tickets = [ticket for ticket in changed_tickets if ticket["_id"] in written_ids]
+        await record_tickets_changed(updated_tickets, update_data)
+        await record_events([
+            ticket_event("updated", ticket, update_data, previous_values(ticket, update_data))
+            for ticket in updated_tickets
+        ])
+    
+    changed_ids = {ticket["_id"] for ticket in changed_tickets}
+    updated_ids = {ticket["_id"] for ticket in updated_tickets}
+    for ticket in previous_tickets:
+        if ticket["_id"] in updated_ids:
+            results[str(ticket["_id"])] = "updated"
+        elif ticket["_id"] in changed_ids:
+            results[str(ticket["_id"])] = "conflict"
+        else:
+            results[str(ticket["_id"])] = "unchanged"
+    
+    if "status" in update_data:
+        notifications = [
+            status_notification(ticket, update_data["status"])
+            for ticket in updated_tickets
+            if ticket.get("status") != update_data["status"] and ticket.get("reported_by")
+        ]
+        if notifications:
+            background_tasks.add_task(enqueue_notifications, notifications)
+    
+    order = bulk.ids if bulk.ids is not None else list(results)
+    return BulkTicketUpdateResponse(
+        matched=len(previous_tickets),
+        modified=len(updated_tickets),
+        results=[BulkTicketResult(id=ticket_id, result=results.get(ticket_id, "not_found")) for ticket_id in order]
+    )
+
 @router.patch("/{ticket_id}", response_model=TicketResponse)
 async def update_ticket(ticket_id: str, ticket_update: TicketUpdate):
     logger.info(f"Updating ticket: {ticket_id}")
@@ -92,18 +438,89 @@ async def update_ticket(ticket_id: str, ticket_update: TicketUpdate):
     
     update_data["updated_at"] = datetime.utcnow()
     
-    result = await tickets_collection.update_one(
+    previous_ticket = await tickets_collection.find_one_and_update(
         {"_id": obj_id},
-        {"$set": update_data}
+        {"$set": update_data},
+        return_document=ReturnDocument.BEFORE
     )
     
-    if result.matched_count == 0:
+    if not previous_ticket:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Ticket not found"
         )
     
-    updated_ticket = await tickets_collection.find_one({"_id": obj_id})
+    await record_ticket_changed(previous_ticket, update_data)
+    await record_events([ticket_event("updated", previous_ticket, update_data, previous_values(previous_ticket, update_data))])
+    
+    updated_ticket = {**previous_ticket, **update_data}
+    updated_ticket["_id"] = str(updated_ticket["_id"])
+    return TicketResponse(**updated_ticket)
+
+@router.post("/{ticket_id}/review", response_model=TicketResponse)
+async def review_duplicate(ticket_id: str, review: DuplicateReview):
+    logger.info(f"Reviewing duplicate flag on ticket: {ticket_id} ({review.action})")
+    
+    try:
+        obj_id = ObjectId(ticket_id)
+    except:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid ticket ID format"
+        )
+    
+    ticket = await tickets_collection.find_one({"_id": obj_id})
+    if not ticket:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ticket not found"
+        )
+    if not ticket.get("needs_review"):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Ticket is not flagged for review"
+        )
+    
+    if review.action == "dismiss":
+        update_data = {"duplicate_of": None, "needs_review": None}
+        update = {"$unset": {"duplicate_of": "", "needs_review": ""}}
+    else:
+        parent_id = ObjectId(ticket["duplicate_of"])
+        if not await tickets_collection.find_one({"_id": parent_id}, {"_id": 1}):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Original ticket no longer exists"
+            )
+        update_data = {"status": "rejected", "needs_review": None}
+        update = {"$set": {"status": "rejected"}, "$unset": {"needs_review": ""}}
+    update_data["updated_at"] = datetime.utcnow()
+    update.setdefault("$set", {})["updated_at"] = update_data["updated_at"]
+    
+    # Only one reviewer can resolve the flag
+    previous_ticket = await tickets_collection.find_one_and_update(
+        {"_id": obj_id, "needs_review": True},
+        update,
+        return_document=ReturnDocument.BEFORE
+    )
+    if not previous_ticket:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Ticket is not flagged for review"
+        )
+    
+    events = [ticket_event("updated", previous_ticket, update_data, previous_values(previous_ticket, update_data))]
+    if review.action == "merge":
+        parent = await attach_duplicate(parent_id, previous_ticket)
+        if parent:
+            events.append(ticket_event("duplicate_attached", parent, {
+                "duplicate_count": parent.get("duplicate_count"),
+                "reported_by": previous_ticket["reported_by"]
+            }))
+        await record_ticket_changed(previous_ticket, update_data)
+    await record_events(events)
+    
+    updated_ticket = {**previous_ticket, **update_data}
+    updated_ticket = {field: value for field, value in updated_ticket.items() if value is not None}
     updated_ticket["_id"] = str(updated_ticket["_id"])
     return TicketResponse(**updated_ticket)
 
@@ -119,30 +536,75 @@ async def add_comment(ticket_id: str, comment: CommentCreate):
             detail="Invalid ticket ID format"
         )
     
-    new_comment = Comment(
-        user_id=comment.user_id,
-        message=comment.message,
-        created_at=datetime.utcnow()
-    )
+    new_comment = {
+        "_id": ObjectId(),
+        "ticket_id": obj_id,
+        "user_id": comment.user_id,
+        "message": comment.message,
+        "created_at": datetime.utcnow()
+    }
     
-    result = await tickets_collection.update_one(
-        {"_id": obj_id},
-        {
-            "$push": {"comments": new_comment.model_dump()},
-            "$set": {"updated_at": datetime.utcnow()}
-        }
-    )
+    await comments_collection.insert_one(new_comment)
+    updated_ticket = await attach_comment(new_comment)
     
-    if result.matched_count == 0:
+    if not updated_ticket:
+        await comments_collection.delete_one({"_id": new_comment["_id"]})
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Ticket not found"
         )
     
-    updated_ticket = await tickets_collection.find_one({"_id": obj_id})
+    await record_events([ticket_event("comment_added", updated_ticket, {
+        "comment_id": new_comment["_id"],
+        "user_id": comment.user_id
+    })])
+    
     updated_ticket["_id"] = str(updated_ticket["_id"])
     return TicketResponse(**updated_ticket)
 
+@router.get("/{ticket_id}/comments", response_model=List[CommentResponse])
+async def get_comments(
+    ticket_id: str,
+    response: Response,
+    limit: int = Query(COMMENTS_PAGE_SIZE, ge=1, le=COMMENTS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
+):
+    logger.info(f"Fetching comments for ticket: {ticket_id}")
+    
+    try:
+        obj_id = ObjectId(ticket_id)
+    except:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid ticket ID format"
+        )
+    
+    query = {"ticket_id": obj_id}
+    if cursor:
+        position = decode_cursor(cursor)
+        if not position:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+        query.update(cursor_filter(*position))
+    
+    documents = await comments_collection.find(query).sort(
+        [("created_at", -1), ("_id", -1)]
+    ).limit(limit + 1).to_list(length=limit + 1)
+    
+    if len(documents) > limit:
+        documents = documents[:limit]
+        last = documents[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last["created_at"], last["_id"])
+    
+    comments = []
+    for comment in documents:
+        comment["_id"] = str(comment["_id"])
+        comment["ticket_id"] = str(comment["ticket_id"])
+        comments.append(CommentResponse(**comment))
+    return comments
+
 @router.post("/{ticket_id}/feedback", response_model=TicketResponse)
 async def add_feedback(ticket_id: str, feedback: FeedbackCreate):
     logger.info(f"Adding feedback to ticket: {ticket_id}")
@@ -158,22 +620,24 @@ async def add_feedback(ticket_id: str, feedback: FeedbackCreate):
     feedback_data = feedback.model_dump()
     feedback_data["created_at"] = datetime.utcnow()
     
-    result = await tickets_collection.update_one(
+    updated_ticket = await tickets_collection.find_one_and_update(
         {"_id": obj_id},
         {
             "$set": {
                 "feedback": feedback_data,
                 "updated_at": datetime.utcnow()
             }
-        }
+        },
+        return_document=ReturnDocument.AFTER
     )
     
-    if result.matched_count == 0:
+    if not updated_ticket:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Ticket not found"
         )
     
-    updated_ticket = await tickets_collection.find_one({"_id": obj_id})
+    await record_events([ticket_event("feedback_added", updated_ticket, {"feedback": feedback_data})])
+    
     updated_ticket["_id"] = str(updated_ticket["_id"])
     return TicketResponse(**updated_ticket)
\ No newline at end of file
@@ -0,0 +1,73 @@
+import re
+from typing import List, Optional
+
+SEARCH_FIELDS = ("title", "description", "location.address")
+SNIPPET_LENGTH = 160
+TOKEN_PATTERN = re.compile(r'-?"[^"]+"|\S+')
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+def search_terms(q: str) -> List[str]:
+    terms = []
+    for token in TOKEN_PATTERN.findall(q):
+        if token.startswith("-"):
+            continue
+        if token.startswith('"'):
+            phrase = token.strip('"').strip()
+            if phrase:
+                terms.append(phrase.lower())
+            continue
+        terms.extend(word.lower() for word in WORD_PATTERN.findall(token))
+    return terms
+
+def _stem(term: str) -> str:
+    # The text index stems words, so "buche" matches "buca". Highlight on a
+    # shortened prefix to catch the inflected forms the index matched.
+    if " " in term or len(term) <= 4:
+        return term
+    return term[:max(4, len(term) - 2)]
+
+def _matches(text: str, terms: List[str]) -> List[List[int]]:
+    lowered = text.lower()
+    spans = []
+    for term in terms:
+        stem = _stem(term)
+        for match in re.finditer(r"\b" + re.escape(stem) + r"\w*", lowered):
+            spans.append([match.start(), match.end()])
+    spans.sort()
+    merged = []
+    for start, end in spans:
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+def _field_value(ticket: dict, field: str) -> Optional[str]:
+    value = ticket
+    for part in field.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value if isinstance(value, str) else None
+
+def snippets(ticket: dict, terms: List[str]) -> List[dict]:
+    result = []
+    for field in SEARCH_FIELDS:
+        text = _field_value(ticket, field)
+        if not text:
+            continue
+        spans = _matches(text, terms)
+        if not spans:
+            continue
+        start = 0
+        if len(text) > SNIPPET_LENGTH:
+            start = max(0, min(spans[0][0] - SNIPPET_LENGTH // 4, len(text) - SNIPPET_LENGTH))
+            while start > 0 and not text[start - 1].isspace():
+                start -= 1
+        end = min(len(text), start + SNIPPET_LENGTH)
+        result.append({
+            "field": field,
+            "text": text[start:end],
+            "highlights": [[s - start, e - start] for s, e in spans if s >= start and e <= end],
+            "truncated_start": start > 0,
+            "truncated_end": end < len(text)
+        })
+    return result
\ No newline at end of file
@@ -0,0 +1,53 @@
+import logging
+from collections import Counter
+from datetime import datetime
+from database import stats_collection
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_ID = "tickets"
+DIMENSIONS = {
+    "status": "by_status",
+    "category": "by_category",
+    "tenant_id": "by_municipality",
+}
+
+def _is_safe_key(key) -> bool:
+    return isinstance(key, str) and key != "" and "." not in key and not key.startswith("$")
+
+async def _apply(increments: Counter):
+    increments = {path: delta for path, delta in increments.items() if delta}
+    if not increments:
+        return
+    
+    if not all(_is_safe_key(path.split(".", 1)[-1]) for path in increments):
+        await stats_collection.update_one({"_id": SNAPSHOT_ID}, {"$set": {"refreshed_at": None}})
+        return
+    
+    await stats_collection.update_one(
+        {"_id": SNAPSHOT_ID},
+        {"$inc": {**increments, "version": 1}, "$set": {"updated_at": datetime.utcnow()}}
+    )
+
+async def record_ticket_created(ticket: dict):
+    increments = Counter({"total_tickets": 1})
+    for field, bucket in DIMENSIONS.items():
+        increments[f"{bucket}.{ticket.get(field)}"] += 1
+    await _apply(increments)
+
+def _changed_increments(before: dict, changes: dict) -> Counter:
+    increments = Counter()
+    for field, bucket in DIMENSIONS.items():
+        if field in changes and changes[field] != before.get(field):
+            increments[f"{bucket}.{before.get(field)}"] -= 1
+            increments[f"{bucket}.{changes[field]}"] += 1
+    return increments
+
+async def record_ticket_changed(before: dict, changes: dict):
+    await _apply(_changed_increments(before, changes))
+
+async def record_tickets_changed(befores: list, changes: dict):
+    increments = Counter()
+    for before in befores:
+        increments.update(_changed_increments(before, changes))
+    await _apply(increments)
\ No newline at end of file
@@ -0,0 +1,42 @@
+import os
+import sys
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [SERVICE_DIR, os.path.dirname(SERVICE_DIR)]
+
+import pytest
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import database
+import comments
+import duplicates
+import events
+import routes
+import stats
+
+@pytest.fixture
+def db(monkeypatch):
+    mock_db = mongomock_motor.AsyncMongoMockClient()["cityfix"]
+    for module in (database, comments, duplicates, events, routes, stats):
+        for name in dir(module):
+            if name.endswith("_collection"):
+                monkeypatch.setattr(module, name, mock_db[getattr(database, name).name])
+    monkeypatch.setattr(routes, "DUPLICATE_ACTION", "off")
+    return mock_db
+
+@pytest.fixture
+def notifications(monkeypatch):
+    sent = []
+    async def enqueue_notifications(batch):
+        sent.extend(batch)
+    monkeypatch.setattr(routes, "enqueue_notifications", enqueue_notifications)
+    return sent
+
+@pytest.fixture
+def client(db, notifications):
+    app = FastAPI()
+    app.include_router(routes.router, prefix="/tickets")
+    return TestClient(app)
\ No newline at end of file
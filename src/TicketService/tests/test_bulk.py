@@ -0,0 +1,137 @@
+import asyncio
+from datetime import datetime
+from bson import ObjectId
+import routes
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+def make_ticket(**fields):
+    ticket = {
+        "_id": ObjectId(),
+        "title": "Buca",
+        "description": "Buca in strada",
+        "location": {"lat": 41.9, "lon": 12.5},
+        "status": "pending",
+        "category": "pothole",
+        "tenant_id": "rome",
+        "reported_by": "citizen",
+        "created_at": datetime(2024, 1, 1),
+        "updated_at": datetime(2024, 1, 1),
+    }
+    ticket.update(fields)
+    return ticket
+
+def seed(db, *tickets):
+    run(db.tickets.insert_many(list(tickets)))
+    run(db.stats.insert_one({
+        "_id": "tickets",
+        "total_tickets": len(tickets),
+        "by_status": {"pending": 0, "in_progress": 0, "completed": 0},
+        "by_category": {},
+        "by_municipality": {},
+        "version": 0
+    }))
+    for ticket in tickets:
+        run(db.stats.update_one({"_id": "tickets"}, {"$inc": {f"by_status.{ticket['status']}": 1}}))
+
+def results(response):
+    return {item["id"]: item["result"] for item in response.json()["results"]}
+
+class ChangedBeforeWrite:
+    def __init__(self, collection, ticket_id, change):
+        self._collection = collection
+        self._ticket_id = ticket_id
+        self._change = change
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+    async def bulk_write(self, requests, **kwargs):
+        await self._collection.update_one({"_id": self._ticket_id}, {"$set": self._change})
+        return await self._collection.bulk_write(requests, **kwargs)
+
+def test_bulk_by_ids(client, db, notifications):
+    pending, done = make_ticket(), make_ticket(status="in_progress")
+    seed(db, pending, done)
+
+    response = client.patch("/tickets/bulk", json={
+        "ids": [str(pending["_id"]), str(done["_id"])],
+        "update": {"status": "in_progress"}
+    })
+
+    assert response.status_code == 200
+    assert response.json()["matched"] == 2
+    assert response.json()["modified"] == 1
+    assert results(response) == {str(pending["_id"]): "updated", str(done["_id"]): "unchanged"}
+    assert run(db.tickets.find_one({"_id": pending["_id"]}))["status"] == "in_progress"
+    assert [notification["user_id"] for notification in notifications] == ["citizen"]
+
+def test_bulk_by_filter(client, db):
+    rome, milan = make_ticket(), make_ticket(tenant_id="milan")
+    seed(db, rome, milan)
+
+    response = client.patch("/tickets/bulk", json={
+        "filter": {"tenant_id": "rome", "status": "pending"},
+        "update": {"assigned_to": "operator"}
+    })
+
+    assert response.status_code == 200
+    assert results(response) == {str(rome["_id"]): "updated"}
+    assert run(db.tickets.find_one({"_id": milan["_id"]})).get("assigned_to") is None
+
+def test_bulk_reports_invalid_and_missing_ids(client, db):
+    ticket = make_ticket()
+    seed(db, ticket)
+    missing = str(ObjectId())
+
+    response = client.patch("/tickets/bulk", json={
+        "ids": ["not-an-id", missing, str(ticket["_id"])],
+        "update": {"status": "completed"}
+    })
+
+    assert response.status_code == 200
+    assert [item["result"] for item in response.json()["results"]] == ["invalid_id", "not_found", "updated"]
+
+def test_bulk_rejects_filter_over_cap(client, db, monkeypatch):
+    monkeypatch.setattr(routes, "TICKETS_BULK_MAX", 2)
+    seed(db, make_ticket(), make_ticket(), make_ticket())
+
+    response = client.patch("/tickets/bulk", json={
+        "filter": {"tenant_id": "rome"},
+        "update": {"status": "completed"}
+    })
+
+    assert response.status_code == 400
+    assert run(db.tickets.count_documents({"status": "completed"})) == 0
+
+def test_bulk_applies_stats_deltas(client, db):
+    seed(db, make_ticket(), make_ticket(), make_ticket(status="in_progress"))
+
+    client.patch("/tickets/bulk", json={
+        "filter": {"tenant_id": "rome"},
+        "update": {"status": "completed"}
+    })
+
+    snapshot = run(db.stats.find_one({"_id": "tickets"}))
+    assert snapshot["by_status"] == {"pending": 0, "in_progress": 0, "completed": 3}
+    assert snapshot["version"] == 1
+
+def test_bulk_skips_tickets_changed_since_read(client, db, notifications, monkeypatch):
+    kept, raced = make_ticket(), make_ticket()
+    seed(db, kept, raced)
+    monkeypatch.setattr(routes, "tickets_collection", ChangedBeforeWrite(routes.tickets_collection, raced["_id"], {"status": "in_progress"}))
+
+    response = client.patch("/tickets/bulk", json={
+        "ids": [str(kept["_id"]), str(raced["_id"])],
+        "update": {"status": "completed"}
+    })
+
+    assert response.json()["modified"] == 1
+    assert results(response) == {str(kept["_id"]): "updated", str(raced["_id"]): "conflict"}
+    assert run(db.tickets.find_one({"_id": raced["_id"]}))["status"] == "in_progress"
+    snapshot = run(db.stats.find_one({"_id": "tickets"}))
+    assert snapshot["by_status"]["pending"] == 1
+    assert snapshot["by_status"]["completed"] == 1
+    assert len(notifications) == 1
+    assert run(db.ticket_events.count_documents({"type": "updated"})) == 1
\ No newline at end of file
@@ -0,0 +1,71 @@
+import asyncio
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo.errors import AutoReconnect
+import events
+
+TICKET = {"_id": ObjectId(), "tenant_id": "rome"}
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+def ids(response):
+    return [event["id"] for event in response.json()["events"]]
+
+def test_changes_wait_for_reserved_events(client, db):
+    run(events.record_events([events.ticket_event("created", TICKET)]))
+    first = run(events._reserve(2))
+    run(events.record_events([events.ticket_event("updated", TICKET)]))
+
+    response = client.get("/tickets/changes")
+    assert ids(response) == ["1"]
+    assert response.json()["next"] == "1"
+
+    run(events._insert([{**events.ticket_event("updated", TICKET), "_id": seq} for seq in (first, first + 1)]))
+    response = client.get("/tickets/changes", params={"since": "1"})
+    assert ids(response) == ["2", "3", "4"]
+    assert response.json()["next"] == "4"
+
+def expire_gap(db):
+    run(db.counters.update_one({"_id": events.EVENT_COUNTER}, {"$set": {"gap_since": datetime.utcnow() - timedelta(minutes=5)}}))
+
+def test_changes_skip_abandoned_reservations(client, db):
+    run(events._reserve(1))
+    run(events.record_events([events.ticket_event("updated", TICKET)]))
+
+    assert ids(client.get("/tickets/changes", params={"tenant_id": "rome"})) == []
+    expire_gap(db)
+    assert ids(client.get("/tickets/changes", params={"tenant_id": "rome"})) == ["2"]
+
+def test_changes_redeliver_late_appends(client, db):
+    first = run(events._reserve(1))
+    run(events.record_events([events.ticket_event("updated", TICKET)]))
+    client.get("/tickets/changes")
+    expire_gap(db)
+    assert ids(client.get("/tickets/changes")) == ["2"]
+
+    run(events._insert([{**events.ticket_event("late", TICKET), "_id": first}]))
+    response = client.get("/tickets/changes", params={"since": "2"})
+    assert ids(response) == ["3"]
+    assert response.json()["events"][0]["type"] == "late"
+    assert ids(client.get("/tickets/changes", params={"since": "3"})) == []
+
+def test_failed_append_does_not_fail_the_request(client, db, monkeypatch):
+    async def broken(events):
+        raise AutoReconnect("connection reset")
+    monkeypatch.setattr(events, "_insert", broken)
+    monkeypatch.setattr(events, "APPEND_RETRY_DELAY", 0)
+
+    response = client.post("/tickets/create", params={"user_id": "citizen"}, json={
+        "title": "Buca",
+        "description": "Buca in strada",
+        "location": {"lat": 41.9, "lon": 12.5},
+        "category": "pothole",
+        "tenant_id": "rome"
+    })
+
+    assert response.status_code == 201
+    assert run(db.ticket_events.count_documents({})) == 0
+
+def test_changes_reject_invalid_token(client, db):
+    assert client.get("/tickets/changes", params={"since": "abc"}).status_code == 400
\ No newline at end of file
@@ -0,0 +1,11 @@
+import pytest
+
+@pytest.mark.parametrize("params, detail", [
+    ({"radius_m": 500}, "radius_m requires near"),
+    ({"near": "41.9,12.5"}, "near requires radius_m"),
+    ({"near": "41.9", "radius_m": 500}, "near must be lat,lon"),
+])
+def test_list_rejects_incomplete_near_filter(client, params, detail):
+    response = client.get("/tickets/list", params=params)
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
\ No newline at end of file
@@ -0,0 +1,52 @@
+import logging
+import time
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+class MissingUniqueIndexes(RuntimeError):
+    pass
+
+async def ensure_indexes(indexes: list):
+    missing_unique = []
+    for collection, models in indexes:
+        for index in models:
+            name = index.document["name"]
+            started = time.perf_counter()
+            try:
+                await collection.create_indexes([index])
+            except PyMongoError as e:
+                logger.error(f"Failed to build index {collection.name}.{name}: {str(e)}")
+                if index.document.get("unique"):
+                    missing_unique.append(f"{collection.name}.{name}")
+                continue
+            elapsed = (time.perf_counter() - started) * 1000
+            logger.info(f"Index {collection.name}.{name} ready in {elapsed:.1f}ms")
+    
+    # Duplicate detection relies on these indexes raising DuplicateKeyError, so
+    # serving without them would silently accept duplicates.
+    if missing_unique:
+        raise MissingUniqueIndexes(f"Unique indexes could not be built: {', '.join(missing_unique)}")
+
+def _plan_stages(plan: dict):
+    yield plan.get("stage")
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            yield from _plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from _plan_stages(child)
+
+async def check_indexes(route_queries: list) -> bool:
+    ok = True
+    for route, collection, query, sort in route_queries:
+        cursor = collection.find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explanation = await cursor.explain()
+        stages = set(_plan_stages(explanation["queryPlanner"]["winningPlan"]))
+        if "COLLSCAN" in stages:
+            ok = False
+            logger.warning(f"COLLSCAN: {route} on {collection.name} {query}")
+        else:
+            logger.info(f"OK: {route} uses {', '.join(sorted(s for s in stages if s))}")
+    return ok
\ No newline at end of file